@@ -1,13 +1,35 @@
-from . import (
-    audio,
-    callback,
-    config,
-    date_and_time,
-    doc,
-    files,
-    json,
-    jsr,
-    rttm,
-    solr_parser,
-    srt,
-)
+"""
+AI common utils.
+
+Submodules are imported lazily on first access (PEP 562), so `import ai_common_utils`
+doesn't import optional heavy dependencies (numpy, pydub, etc.) of unused submodules.
+"""
+
+import importlib
+
+__all__ = [
+    "audio",
+    "callback",
+    "config",
+    "date_and_time",
+    "doc",
+    "files",
+    "json",
+    "jsr",
+    "profiler",
+    "rttm",
+    "solr_indexer",
+    "solr_parser",
+    "srt",
+]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        # import_module also sets submodule as attribute of package
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
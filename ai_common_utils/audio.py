@@ -3,17 +3,39 @@ Audio utils for AI projects.
 """
 
 import io
+import os
+import mmap
 import wave
+import struct
+import hashlib
 import logging
 import datetime
+import tempfile
+import threading
 import subprocess
-from typing import Union
+from typing import Iterator, List, NamedTuple, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 from .files import check_file
+from .profiler import add_bytes, profile
+from .rttm import get_ts_and_names
 
 
 try:
     import numpy as np
+except ImportError:
+    np = None
+    logging.error(
+        "Numpy not installed. audio.int2float, audio.audio2numpy, audio.SharedAudio, "
+        "audio.iter_audio_windows, audio.energy_vad, audio.get_replicas_stats not allowed!"
+    )
+
+
+if np is not None:
 
     def int2float(sound: np.int16) -> np.float32:
         """
@@ -36,8 +58,46 @@ try:
         sound = sound.squeeze()
         return sound
 
-except ImportError:
-    logging.error("Numpy not installed. audio.int2float not allowed!")
+    def audio2numpy(audio: Union[io.BytesIO, mmap.mmap, bytes]) -> np.ndarray:
+        """
+        Function for getting zero-copy np.int16 view of PCM samples of decoded audio.
+
+        Parameters
+        ----------
+        audio: Union[io.BytesIO, mmap.mmap, bytes]
+            Decoded audio from `get_audio` (WAV with 16 bit PCM) or raw 16 bit PCM.
+
+        Returns
+        -------
+        sound: np.int16
+            Sound samples without copy of audio data.
+        """
+        buffer = audio.getbuffer() if type(audio) == io.BytesIO else audio
+        offset, size = _get_wav_data_chunk(buffer)
+        return np.frombuffer(buffer, dtype=np.int16, count=size // 2, offset=offset)
+
+
+def _get_wav_data_chunk(buffer) -> tuple:
+    """
+    Get offset and size in bytes of samples data in WAV buffer (whole buffer for raw PCM).
+    """
+    length = len(buffer)
+    if length < 12 or bytes(buffer[:4]) != b"RIFF" or bytes(buffer[8:12]) != b"WAVE":
+        return 0, length - length % 2
+
+    pos = 12
+    while pos + 8 <= length:
+        chunk_id = bytes(buffer[pos : pos + 4])
+        (chunk_size,) = struct.unpack("<I", buffer[pos + 4 : pos + 8])
+        pos += 8
+        if chunk_id == b"data":
+            # ffmpeg writes unknown size (0 or 0xFFFFFFFF) when output is a pipe
+            if chunk_size == 0 or pos + chunk_size > length:
+                chunk_size = length - pos
+            return pos, chunk_size - chunk_size % 2
+        pos += chunk_size + chunk_size % 2
+
+    raise ValueError("Data chunk not found in WAV audio!")
 
 
 try:
@@ -141,86 +201,207 @@ def get_hms(seconds: float):
     return "{:02.0f}:{:02.0f}:{:02.0f}".format(hours, minutes, seconds)
 
 
-def get_audio(
-    data: Union[str, io.BytesIO, bytes],
-    time_start: float = None,
-    time_end: float = None,
-):
+class AudioCache:
     """
-    Universal function for get audio from different types of data (path, obj, video).
+    Content-addressed disk cache for decoded audio (16 kHz mono PCM WAV, as returned by `get_audio`).
 
-    Parameters
+    Entries are keyed by source (content hash, or path + mtime + size) and `time_start`/`time_end`.
+    Total cache size is bounded with LRU eviction. Several processes can share one cache directory:
+    entries are written to temp file and atomically renamed, eviction is guarded by file lock.
+
+    Args
     ----------
-    data: Union[str, io.BytesIO, bytes]
-        Path to audio file, obj file or video.
+        `path_cache` (opt): directory of cache. Default `~/.cache/ai_common_utils/audio`.
 
-    Returns
-    -------
-    audio: io.BytesIO
-        Bytes tempalte file of audio.
+        `max_size` (opt=2GB): max total size of cache in bytes.
+
+        `hash_files` (opt=False): key path sources by content hash instead of path + mtime + size.
     """
 
-    if type(data) == str:
-        cmd = ["ffmpeg"]
-
-        if time_start:
-            cmd.extend(["-ss", get_hms(time_start)])
-
-            if time_end and time_end > time_start:
-                cmd.extend(["-t", get_hms(time_end - time_start)])
-
-        cmd.extend(
-            [
-                "-i",
-                data,
-                "-acodec",
-                "pcm_s16le",
-                "-ar",
-                "16000",
-                "-ac",
-                "1",
-                "pipe:.wav",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-            ]
-        )
+    VERSION = "pcm_s16le-16000-1"
 
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stdin=subprocess.PIPE)
-        out = proc.communicate()[0]
+    def __init__(
+        self,
+        path_cache: str = None,
+        max_size: int = 2 * 1024**3,
+        hash_files: bool = False,
+    ) -> None:
+        if not path_cache:
+            path_cache = os.path.join(
+                os.path.expanduser("~"), ".cache", "ai_common_utils", "audio"
+            )
+        self.path_cache = path_cache
+        self.max_size = max_size
+        self.hash_files = hash_files
+        os.makedirs(self.path_cache, exist_ok=True)
 
-        proc.wait()
-
-        return io.BytesIO(out)
-
-    elif type(data) == io.BytesIO or type(data) == bytes:
-        if type(data) == io.BytesIO:
-            data = data.getvalue()
-
-        cmd = ["ffmpeg"]
-
-        if time_start:
-            cmd.extend(["-ss", get_hms(time_start)])
-
-            if time_end and time_end > time_start:
-                cmd.extend(["-t", get_hms(time_end - time_start)])
-        cmd.extend(
-            [
-                "-i",
-                "-",
-                "-acodec",
-                "pcm_s16le",
-                "-ar",
-                "16000",
-                "-ac",
-                "1",
-                "pipe:.wav",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-            ]
-        )
+    def key(
+        self,
+        data: Union[str, io.BytesIO, bytes, mmap.mmap],
+        time_start: float = None,
+        time_end: float = None,
+    ) -> str:
+        """
+        Get cache key for source and time interval.
+
+        Parameters
+        ----------
+        data: Union[str, io.BytesIO, bytes, mmap.mmap]
+            Path to audio file, obj file or video.
+        time_start: float
+            Float time from which start in seconds.
+        time_end: float
+            Float time when interval ended in seconds.
+
+        Returns
+        -------
+        key: str
+            Hex digest key.
+        """
+        h = hashlib.blake2b(digest_size=20)
+
+        if type(data) == str:
+            if self.hash_files:
+                with open(data, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+            else:
+                stat = os.stat(data)
+                h.update(
+                    f"{os.path.abspath(data)}|{stat.st_mtime_ns}|{stat.st_size}".encode(
+                        "utf-8"
+                    )
+                )
+        elif type(data) == io.BytesIO:
+            h.update(data.getbuffer())
+        else:
+            h.update(data)
+
+        h.update(f"|{time_start}|{time_end}|{self.VERSION}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.path_cache, f"{key}.wav")
+
+    def get(self, key: str) -> Union[mmap.mmap, None]:
+        """
+        Get cached audio as read-only memory map, or None if not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return audio
+
+    def put(self, key: str, audio: bytes) -> mmap.mmap:
+        """
+        Save decoded audio to cache and return it as read-only memory map.
+        """
+        fd, path_tmp = tempfile.mkstemp(dir=self.path_cache, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(path_tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(path_tmp):
+                os.remove(path_tmp)
+            raise
+
+        self.evict(keep=key)
+
+        cached = self.get(key)
+        return cached if cached is not None else io.BytesIO(audio)
+
+    def evict(self, keep: str = None):
+        """
+        Remove least recently used entries until cache size is not greater than `max_size`.
+
+        Args
+        ----------
+            `keep` (opt): key of entry that should not be removed.
+        """
+        with open(os.path.join(self.path_cache, ".lock"), "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
 
+            entries = []
+            size = 0
+            for entry in os.scandir(self.path_cache):
+                if not entry.name.endswith(".wav"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                size += stat.st_size
+
+            if size <= self.max_size:
+                return
+
+            path_keep = self._path(keep) if keep else None
+            for _, entry_size, path in sorted(entries):
+                if size <= self.max_size:
+                    break
+                if path == path_keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= entry_size
+
+    def clear(self):
+        """
+        Remove all entries from cache.
+        """
+        self.max_size, max_size = -1, self.max_size
+        try:
+            self.evict()
+        finally:
+            self.max_size = max_size
+
+
+def _ffmpeg_decode(
+    data: Union[str, bytes],
+    time_start: float = None,
+    time_end: float = None,
+) -> bytes:
+    cmd = ["ffmpeg"]
+
+    if time_start:
+        cmd.extend(["-ss", get_hms(time_start)])
+
+        if time_end and time_end > time_start:
+            cmd.extend(["-t", get_hms(time_end - time_start)])
+
+    cmd.extend(
+        [
+            "-i",
+            data if type(data) == str else "-",
+            "-acodec",
+            "pcm_s16le",
+            "-ar",
+            "16000",
+            "-ac",
+            "1",
+            "pipe:.wav",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+        ]
+    )
+
+    if type(data) == str:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stdin=subprocess.PIPE)
+        out = proc.communicate()[0]
+    else:
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
@@ -230,24 +411,71 @@ def get_audio(
         )
         out = proc.communicate(input=data, timeout=None)[0]
 
-        proc.wait()
+    proc.wait()
 
-        return io.BytesIO(out)
+    return out
 
-    else:
+
+@profile()
+def get_audio(
+    data: Union[str, io.BytesIO, bytes, mmap.mmap],
+    time_start: float = None,
+    time_end: float = None,
+    cache: AudioCache = None,
+):
+    """
+    Universal function for get audio from different types of data (path, obj, video).
+
+    Parameters
+    ----------
+    data: Union[str, io.BytesIO, bytes, mmap.mmap]
+        Path to audio file, obj file or video (memory map - e.g. audio from cache).
+    time_start: float
+        Float time from which start in seconds.
+    time_end: float
+        Float time when interval ended in seconds.
+    cache: AudioCache
+        Optional decode cache. If provided, decoded audio is stored on disk
+        and returned as read-only memory map (`mmap.mmap`).
+
+    Returns
+    -------
+    audio: Union[io.BytesIO, mmap.mmap]
+        Bytes tempalte file of audio.
+    """
+
+    if type(data) not in (str, io.BytesIO, bytes, mmap.mmap):
         raise TypeError(
             "Unsupported type of input! Put in func str path to file or io.BytesIO."
         )
 
+    key = None
+    if cache:
+        key = cache.key(data, time_start, time_end)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if type(data) == io.BytesIO:
+        data = data.getvalue()
+
+    out = _ffmpeg_decode(data, time_start, time_end)
+    add_bytes(len(out))
 
-def get_time_audio(audio: io.BytesIO, return_str: bool = True):
+    if key and out:
+        return cache.put(key, out)
+
+    return io.BytesIO(out)
+
+
+def get_time_audio(audio: Union[io.BytesIO, mmap.mmap], return_str: bool = True):
     """
     Get time of audio from temp file bytes.
 
     Parameters
     ----------
-    audio: io.BytesIO
-        Temp audio file.
+    audio: Union[io.BytesIO, mmap.mmap]
+        Temp audio file (or memory map from `AudioCache`).
     return_str: bool
         True - Return str time.
 
@@ -273,3 +501,676 @@ def get_time_audio(audio: io.BytesIO, return_str: bool = True):
         return str(datetime.timedelta(seconds=int(nframes / framerate)))
     else:
         return datetime.timedelta(seconds=int(nframes / framerate))
+
+
+class SharedAudioHandle(NamedTuple):
+    """
+    Small picklable handle to decoded audio in shared memory (see `SharedAudio`).
+
+    Args
+    ----------
+        `name` : name of shared memory block.
+
+        `offset` : offset of first sample in samples.
+
+        `n_samples` : count of samples.
+
+        `dtype` (opt="int16"): format of samples.
+
+        `rate` (opt=16000): sample rate.
+    """
+
+    name: str
+    offset: int
+    n_samples: int
+    dtype: str = "int16"
+    rate: int = 16000
+
+    def cut(self, time_start: float = None, time_end: float = None):
+        """
+        Get handle to segment of audio with setted start time and end time in seconds
+        (relative to this handle, like `cut_audio_bytes`).
+        """
+        start = min(int(time_start * self.rate), self.n_samples) if time_start else 0
+        end = (
+            min(int(time_end * self.rate), self.n_samples)
+            if time_end
+            else self.n_samples
+        )
+        return self._replace(offset=self.offset + start, n_samples=max(end - start, 0))
+
+    def attach(self):
+        """
+        Attach to shared memory block (in worker process).
+
+        Returns
+        -------
+        view: SharedAudioView
+            Context manager with zero-copy `array` of samples.
+        """
+        return SharedAudioView(self)
+
+
+if np is not None:
+    from multiprocessing import shared_memory
+
+    class SharedAudioView:
+        """
+        Zero-copy view of audio in shared memory. Use as context manager or call `close`.
+
+        Args
+        ----------
+            `handle` : handle to shared audio.
+        """
+
+        def __init__(self, handle: SharedAudioHandle) -> None:
+            self.handle = handle
+            self._shm = shared_memory.SharedMemory(name=handle.name)
+            self.array = np.ndarray(
+                (handle.n_samples,),
+                dtype=handle.dtype,
+                buffer=self._shm.buf,
+                offset=handle.offset * np.dtype(handle.dtype).itemsize,
+            )
+
+        def to_wav(self) -> io.BytesIO:
+            """
+            Copy samples into WAV temp file (for `get_audio_seg`, `get_time_audio` etc.).
+            """
+            temp_f = io.BytesIO()
+            with wave.open(temp_f, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(self.array.itemsize)
+                wf.setframerate(self.handle.rate)
+                wf.writeframes(self.array.tobytes())
+            temp_f.seek(0)
+            return temp_f
+
+        def close(self):
+            self.array = None
+            try:
+                self._shm.close()
+            except BufferError:
+                # Views of array still exist, mapping will be released with them.
+                pass
+
+        def __enter__(self) -> np.ndarray:
+            return self.array
+
+        def __exit__(self, *args) -> None:
+            self.close()
+
+    class SharedAudio:
+        """
+        Decoded audio in `multiprocessing.shared_memory` block for zero-copy handoff to worker processes.
+
+        Parent process creates it (or uses `share_audio`), passes `handle()` to workers and
+        calls `release(handle)` when task is done. Block is unlinked, when `close` was called
+        and all handles are released (or at exit of context manager).
+
+        Args
+        ----------
+            `sound` : np.int16 samples.
+
+            `rate` (opt=16000): sample rate.
+        """
+
+        def __init__(self, sound: np.ndarray, rate: int = 16000) -> None:
+            sound = np.ascontiguousarray(sound).reshape(-1)
+            self.rate = rate
+            self.dtype = sound.dtype.name
+            self.n_samples = sound.size
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=max(sound.nbytes, 1)
+            )
+            np.ndarray(sound.shape, dtype=sound.dtype, buffer=self._shm.buf)[:] = sound
+            self._refs = 0
+            self._closed = False
+            self._unlinked = False
+            self._lock = threading.Lock()
+
+        @property
+        def name(self) -> str:
+            return self._shm.name
+
+        def handle(self, time_start: float = None, time_end: float = None):
+            """
+            Get new handle to audio (or to segment with setted start and end time in seconds).
+            Each handle should be released with `release`.
+            """
+            with self._lock:
+                if self._unlinked:
+                    raise ValueError("Shared audio already unlinked!")
+                self._refs += 1
+            return SharedAudioHandle(
+                self.name, 0, self.n_samples, self.dtype, self.rate
+            ).cut(time_start, time_end)
+
+        def release(self, handle: SharedAudioHandle = None):
+            """
+            Release handle got from `handle`.
+            """
+            with self._lock:
+                self._refs = max(self._refs - 1, 0)
+                if self._closed and self._refs == 0:
+                    self._unlink()
+
+        def close(self):
+            """
+            Unlink shared memory block after all handles are released.
+            """
+            with self._lock:
+                self._closed = True
+                if self._refs == 0:
+                    self._unlink()
+
+        def _unlink(self):
+            if not self._unlinked:
+                self._unlinked = True
+                self._shm.close()
+                self._shm.unlink()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args) -> None:
+            with self._lock:
+                self._closed = True
+                self._unlink()
+
+    def share_audio(
+        data: Union[str, io.BytesIO, bytes],
+        time_start: float = None,
+        time_end: float = None,
+        cache: AudioCache = None,
+    ) -> SharedAudio:
+        """
+        Decode audio once (see `get_audio`) into shared memory block.
+
+        Parameters
+        ----------
+        data: Union[str, io.BytesIO, bytes]
+            Path to audio file, obj file or video.
+        time_start: float
+            Float time from which start in seconds.
+        time_end: float
+            Float time when interval ended in seconds.
+        cache: AudioCache
+            Optional decode cache.
+
+        Returns
+        -------
+        audio: SharedAudio
+            Shared audio, use `handle()` for passing to workers.
+        """
+        return SharedAudio(audio2numpy(get_audio(data, time_start, time_end, cache)))
+
+
+class AudioWindow(NamedTuple):
+    """
+    Fixed-size window of audio (see `iter_audio_windows`).
+
+    Args
+    ----------
+        `time_start` : absolute time in seconds of window start (offset for `change_all_time_jsr`).
+
+        `time_end` : absolute time in seconds of end of real (not padded) audio in window.
+
+        `samples` : np.int16 samples of window.
+    """
+
+    time_start: float
+    time_end: float
+    samples: "np.ndarray"
+
+
+if np is not None:
+
+    def _iter_pcm_chunks(audio, chunk_size: int) -> Iterator[np.ndarray]:
+        if isinstance(audio, wave.Wave_read):
+            while True:
+                frames = audio.readframes(chunk_size)
+                if not frames:
+                    return
+                yield np.frombuffer(frames, dtype=np.int16)
+        elif hasattr(audio, "read"):
+            rest = b""
+            while True:
+                frames = audio.read(chunk_size * 2)
+                if not frames:
+                    return
+                frames = rest + frames
+                rest = frames[len(frames) - len(frames) % 2 :]
+                yield np.frombuffer(frames, dtype=np.int16, count=len(frames) // 2)
+        else:
+            for chunk in audio:
+                if type(chunk) != np.ndarray:
+                    chunk = np.frombuffer(chunk, dtype=np.int16)
+                yield chunk.reshape(-1)
+
+    def _iter_stream_windows(
+        chunks: Iterator[np.ndarray], n_window: int, n_hop: int, rate: int, pad: bool
+    ) -> Iterator[AudioWindow]:
+        buffer = np.zeros(n_window, dtype=np.int16)
+        filled = 0
+        offset = 0
+        chunk = np.zeros(0, dtype=np.int16)
+
+        while True:
+            while filled < n_window:
+                if not chunk.size:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                n = min(n_window - filled, chunk.size)
+                buffer[filled : filled + n] = chunk[:n]
+                chunk = chunk[n:]
+                filled += n
+
+            if filled < n_window:
+                if filled > n_window - n_hop or offset == 0:
+                    # Last window (or whole audio) is shorter than window
+                    if filled:
+                        buffer[filled:] = 0
+                        yield AudioWindow(
+                            offset / rate,
+                            (offset + filled) / rate,
+                            buffer if pad else buffer[:filled],
+                        )
+                return
+
+            yield AudioWindow(offset / rate, (offset + n_window) / rate, buffer)
+
+            if not chunk.size:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+            buffer[: n_window - n_hop] = buffer[n_hop:]
+            filled = n_window - n_hop
+            offset += n_hop
+
+    def iter_audio_windows(
+        audio: Union[
+            np.ndarray, io.BytesIO, mmap.mmap, bytes, wave.Wave_read, Iterator
+        ],
+        window: float = 30,
+        overlap: float = 5,
+        rate: int = 16000,
+        pad: bool = True,
+        chunk_size: int = 1 << 16,
+    ) -> Iterator[AudioWindow]:
+        """
+        Iterate over overlapping fixed-size windows of audio.
+
+        For decoded audio (np.ndarray, io.BytesIO or mmap.mmap from `get_audio`, bytes) windows
+        are zero-copy views of samples. For streaming sources (opened `wave.Wave_read`, file object
+        with raw 16 bit PCM, iterator of np.int16 or bytes chunks) windows are views of one reused
+        buffer, valid until next iteration.
+
+        Parameters
+        ----------
+        audio: Union[np.ndarray, io.BytesIO, mmap.mmap, bytes, wave.Wave_read, Iterator]
+            Decoded audio or streaming source.
+        window: float
+            Window size in seconds.
+        overlap: float
+            Overlap of neighbouring windows in seconds.
+        rate: int
+            Sample rate.
+        pad: bool
+            Pad last window with zeros up to window size.
+        chunk_size: int
+            Count of samples read at once from streaming source.
+
+        Returns
+        -------
+        windows: Iterator[AudioWindow]
+            Windows with absolute time offsets, that can be directly passed
+            to `jsr.change_all_time_jsr` for recognized window.
+        """
+        n_window = int(window * rate)
+        n_hop = n_window - int(overlap * rate)
+        if n_window <= 0 or n_hop <= 0:
+            raise ValueError("window should be > 0 and overlap should be < window!")
+
+        if isinstance(audio, (io.BytesIO, mmap.mmap, bytes, bytearray)):
+            audio = audio2numpy(audio)
+
+        if type(audio) != np.ndarray:
+            yield from _iter_stream_windows(
+                _iter_pcm_chunks(audio, chunk_size), n_window, n_hop, rate, pad
+            )
+            return
+
+        audio = audio.reshape(-1)
+        n_samples = audio.size
+        offset = 0
+
+        while offset < n_samples:
+            samples = audio[offset : offset + n_window]
+            n = samples.size
+            if n < n_window and pad:
+                samples = np.zeros(n_window, dtype=audio.dtype)
+                samples[:n] = audio[offset:]
+            yield AudioWindow(offset / rate, (offset + n) / rate, samples)
+
+            if offset + n_window >= n_samples:
+                return
+            offset += n_hop
+
+    def iter_audio_batches(
+        audio: Union[
+            np.ndarray, io.BytesIO, mmap.mmap, bytes, wave.Wave_read, Iterator
+        ],
+        batch_size: int,
+        window: float = 30,
+        overlap: float = 5,
+        rate: int = 16000,
+        dtype: str = "float32",
+        out: np.ndarray = None,
+        chunk_size: int = 1 << 16,
+    ) -> Iterator[Tuple[np.ndarray, List[Tuple[float, float]]]]:
+        """
+        Iterate over batches of overlapping fixed-size windows of audio (see `iter_audio_windows`).
+
+        Windows are stacked into one preallocated batch array, which is reused between iterations.
+        Float dtypes are scaled to [-1, 1).
+
+        Parameters
+        ----------
+        audio: Union[np.ndarray, io.BytesIO, mmap.mmap, bytes, wave.Wave_read, Iterator]
+            Decoded audio or streaming source.
+        batch_size: int
+            Max count of windows in batch.
+        window: float
+            Window size in seconds.
+        overlap: float
+            Overlap of neighbouring windows in seconds.
+        rate: int
+            Sample rate.
+        dtype: str
+            Dtype of batch array (if `out` not provided).
+        out: np.ndarray
+            Preallocated batch array of (batch_size, window * rate) shape (e.g. pinned memory).
+        chunk_size: int
+            Count of samples read at once from streaming source.
+
+        Returns
+        -------
+        batches: Iterator[Tuple[np.ndarray, List[Tuple[float, float]]]]
+            Batch array (view of first filled rows of `out`) and (time_start, time_end) of each window.
+        """
+        n_window = int(window * rate)
+        if out is None:
+            out = np.empty((batch_size, n_window), dtype=dtype)
+        elif out.shape != (batch_size, n_window):
+            raise ValueError(f"out shape should be {(batch_size, n_window)}!")
+
+        scale = 1 / 32768 if np.issubdtype(out.dtype, np.floating) else None
+        times = []
+
+        for time_start, time_end, samples in iter_audio_windows(
+            audio, window, overlap, rate, False, chunk_size
+        ):
+            row = out[len(times)]
+            n = samples.size
+            if scale:
+                np.multiply(samples, scale, out=row[:n], casting="unsafe")
+            else:
+                row[:n] = samples
+            row[n:] = 0
+            times.append((time_start, time_end))
+
+            if len(times) == batch_size:
+                yield out, times
+                times = []
+
+        if times:
+            yield out[: len(times)], times
+
+
+if np is not None:
+
+    def energy_vad(
+        audio: Union[np.ndarray, io.BytesIO, mmap.mmap, bytes],
+        frame: float = 0.03,
+        energy_threshold: float = -40.0,
+        zcr_threshold: float = None,
+        zcr_energy_threshold: float = -55.0,
+        hangover: float = 0.3,
+        min_speech: float = 0.1,
+        rate: int = 16000,
+        block_frames: int = 8192,
+    ) -> List[dict]:
+        """
+        Fast energy / zero-crossing rate voice activity detection (pre-VAD) on np.int16 audio.
+
+        Frame is speech if its energy is not lower than `energy_threshold`, or (if `zcr_threshold`
+        provided) its zero-crossing rate is not lower than `zcr_threshold` and energy is not lower
+        than `zcr_energy_threshold` (unvoiced sounds). Speech is extended by `hangover` after each
+        speech frame, so short pauses don't split replicas.
+
+        Parameters
+        ----------
+        audio: Union[np.ndarray, io.BytesIO, mmap.mmap, bytes]
+            np.int16 samples or decoded audio from `get_audio`.
+        frame: float
+            Frame size in seconds.
+        energy_threshold: float
+            Threshold of frame RMS energy in dBFS.
+        zcr_threshold: float
+            Threshold of frame zero-crossing rate (crossings per sample, 0..1).
+        zcr_energy_threshold: float
+            Min frame RMS energy in dBFS for frames detected by zero-crossing rate.
+        hangover: float
+            Time in seconds, during which speech continues after last speech frame.
+        min_speech: float
+            Min duration in seconds of speech interval.
+        rate: int
+            Sample rate.
+        block_frames: int
+            Count of frames processed at once (bounds memory for long audio).
+
+        Returns
+        -------
+        jsr: List[dict]
+            VAD JSR (same format as `jsr.get_vad_jsr`).
+        """
+        if type(audio) != np.ndarray:
+            audio = audio2numpy(audio)
+
+        n_frame = max(int(frame * rate), 1)
+        n_frames = audio.size // n_frame
+        frames = audio[: n_frames * n_frame].reshape(n_frames, n_frame)
+
+        # Compare mean square energy with thresholds instead of computing dB of each frame
+        def db2power(db):
+            return (10 ** (db / 10)) * 32768.0**2 * n_frame
+
+        power_threshold = db2power(energy_threshold)
+        zcr_power_threshold = db2power(zcr_energy_threshold)
+        zcr_count_threshold = zcr_threshold * (n_frame - 1) if zcr_threshold else None
+
+        speech = np.empty(n_frames, dtype=bool)
+        for i in range(0, n_frames, block_frames):
+            block = frames[i : i + block_frames].astype(np.float32)
+            power = np.einsum("ij,ij->i", block, block)
+            is_speech = power >= power_threshold
+            if zcr_count_threshold is not None:
+                signs = np.signbit(block)
+                zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+                is_speech |= (zcr >= zcr_count_threshold) & (
+                    power >= zcr_power_threshold
+                )
+            speech[i : i + block_frames] = is_speech
+
+        n_hangover = int(round(hangover * rate / n_frame))
+        if n_hangover > 0 and n_frames:
+            counts = np.cumsum(speech, dtype=np.int64)
+            counts[n_hangover + 1 :] -= counts[: -n_hangover - 1].copy()
+            speech = counts > 0
+
+        edges = np.flatnonzero(np.diff(speech.astype(np.int8), prepend=0, append=0))
+        starts, ends = edges[::2], edges[1::2]
+        keep = (ends - starts) * n_frame >= min_speech * rate
+
+        return [
+            {
+                "speech": {
+                    "time_start": start * n_frame / rate,
+                    "time_end": end * n_frame / rate,
+                    "duration": (end - start) * n_frame / rate,
+                }
+            }
+            for start, end in zip(starts[keep].tolist(), ends[keep].tolist())
+        ]
+
+
+if np is not None:
+
+    def _power2db(power: np.ndarray) -> np.ndarray:
+        return 10 * np.log10(np.maximum(power, 1e-12))
+
+    def get_replicas_stats(
+        audio: Union[np.ndarray, io.BytesIO, mmap.mmap, bytes],
+        jsr: Union[List[dict], List[List[str]]],
+        rate: int = 16000,
+        clip_level: int = 32767,
+    ) -> dict:
+        """
+        Compute audio statistics of all replicas of JSR (or lines of RTTM) at once.
+
+        Audio is reduced once over sorted unique boundaries of all replicas (`np.add.reduceat`),
+        replicas statistics are computed from prefix sums of these elementary intervals,
+        so cost is one pass over audio regardless of count of replicas (replicas may overlap).
+        Levels are in dBFS, SNR is estimated against mean power of audio outside of all replicas.
+
+        Parameters
+        ----------
+        audio: Union[np.ndarray, io.BytesIO, mmap.mmap, bytes]
+            np.int16 samples or decoded audio from `get_audio`.
+        jsr: Union[List[dict], List[List[str]]]
+            JSR or list rttm.
+        rate: int
+            Sample rate.
+        clip_level: int
+            Absolute value of sample, from which sample is clipped.
+
+        Returns
+        -------
+        stats: dict
+            {"replicas": [{"rms_db", "peak_db", "clipping", "snr_db"}, ...] (in order of jsr),
+            "speakers": {speaker_idx: {"rms_db", "peak_db", "clipping", "snr_db", "duration"}}}
+        """
+        if type(audio) != np.ndarray:
+            audio = audio2numpy(audio)
+        audio = audio.reshape(-1)
+        n_samples = audio.size
+
+        if jsr and type(jsr[0]) == list:
+            segments = [
+                (t_start, t_end, name.split("/")[0])
+                for t_start, t_end, name in get_ts_and_names(jsr, do_enumerate=False)
+            ]
+        else:
+            segments = [
+                (
+                    replica["speech"]["time_start"],
+                    replica["speech"]["time_end"],
+                    replica["speaker"]["idx"] if "speaker" in replica else None,
+                )
+                for replica in jsr
+            ]
+
+        if not segments or not n_samples:
+            return {"replicas": [], "speakers": {}}
+
+        times = np.array([(t_start, t_end) for t_start, t_end, _ in segments])
+        bounds = np.clip(np.rint(times * rate).astype(np.int64), 0, n_samples)
+        bounds[:, 1] = np.maximum(bounds[:, 0], bounds[:, 1])
+
+        # Elementary intervals between all boundaries (last one ends at end of audio)
+        edges = np.unique(np.concatenate([[0], bounds.ravel()]))
+        edges = edges[edges < n_samples]
+        lengths = np.diff(edges, append=n_samples)
+
+        squares = audio.astype(np.int32)
+        squares *= squares
+        clipped = (audio >= clip_level) | (audio <= -clip_level)
+
+        sums = np.add.reduceat(squares, edges, dtype=np.float64)
+        clips = np.add.reduceat(clipped, edges, dtype=np.int64)
+        peaks = np.maximum(
+            np.maximum.reduceat(audio, edges).astype(np.int32),
+            -np.minimum.reduceat(audio, edges).astype(np.int32),
+        )
+
+        # Noise power from intervals, not covered with any segment
+        idx = np.searchsorted(edges, bounds)
+        coverage = np.zeros(edges.size + 1, dtype=np.int64)
+        np.add.at(coverage, idx[:, 0], 1)
+        np.add.at(coverage, idx[:, 1], -1)
+        silence = np.cumsum(coverage[:-1]) == 0
+        n_silence = lengths[silence].sum()
+        noise = sums[silence].sum() / n_silence if n_silence else None
+
+        # Prefix sums over elementary intervals
+        prefix_sums = np.concatenate([[0], np.cumsum(sums)])
+        prefix_clips = np.concatenate([[0], np.cumsum(clips)])
+        seg_n = bounds[:, 1] - bounds[:, 0]
+        seg_sums = prefix_sums[idx[:, 1]] - prefix_sums[idx[:, 0]]
+        seg_clips = prefix_clips[idx[:, 1]] - prefix_clips[idx[:, 0]]
+
+        # Max over ranges of elementary intervals: interleaved reduceat, even positions
+        seg_peaks = np.zeros(len(segments), dtype=np.int32)
+        nonempty = idx[:, 1] > idx[:, 0]
+        if nonempty.any():
+            ranges = idx[nonempty].ravel()
+            seg_peaks[nonempty] = np.maximum.reduceat(np.append(peaks, 0), ranges)[::2]
+
+        def get_stats(n, sq_sum, clip_sum, peak) -> List[dict]:
+            power = sq_sum / np.maximum(n, 1)
+            snr_db = (
+                _power2db(power / max(noise, 1e-12)).tolist()
+                if noise is not None
+                else [None] * len(power)
+            )
+            return [
+                {
+                    "rms_db": rms_db,
+                    "peak_db": peak_db,
+                    "clipping": clipping,
+                    "snr_db": snr,
+                }
+                for rms_db, peak_db, clipping, snr in zip(
+                    _power2db(power / 32768.0**2).tolist(),
+                    _power2db((peak / 32768.0) ** 2).tolist(),
+                    (clip_sum / np.maximum(n, 1)).tolist(),
+                    snr_db,
+                )
+            ]
+
+        replicas = get_stats(seg_n, seg_sums, seg_clips, seg_peaks)
+
+        _, first_idx, speaker_idx = np.unique(
+            [str(name) for _, _, name in segments],
+            return_index=True,
+            return_inverse=True,
+        )
+        speaker_idx = speaker_idx.reshape(-1)
+        n_speakers = first_idx.size
+        speaker_n = np.bincount(speaker_idx, seg_n, n_speakers)
+        speaker_peaks = np.zeros(n_speakers, dtype=np.int32)
+        np.maximum.at(speaker_peaks, speaker_idx, seg_peaks)
+        speaker_stats = get_stats(
+            speaker_n,
+            np.bincount(speaker_idx, seg_sums, n_speakers),
+            np.bincount(speaker_idx, seg_clips, n_speakers),
+            speaker_peaks,
+        )
+        speakers = {
+            segments[i][2]: {**stats, "duration": float(n / rate)}
+            for i, n, stats in zip(first_idx.tolist(), speaker_n, speaker_stats)
+        }
+
+        return {"replicas": replicas, "speakers": speakers}
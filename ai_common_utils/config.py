@@ -4,13 +4,192 @@ Config utils.
 
 import pathlib
 import os
-from typing import Union
-import inspect
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
 
-from .files import open_json
+from .files import freeze, load_env_file, open_json, thaw
+from .json import loads
 
+# Resolved paths of config.json by (file of calling module, level)
+_CONFIG_PATHS: Dict[Tuple[str, int], str] = {}
 
-def load_config(config: Union[str, dict] = None, level: int = 4):
+# Max count of cached layered configs (least recently used are evicted)
+MAX_LAYERED_CONFIGS = 128
+
+# Merged layered configs of files by (path, snapshot of defaults, env_file, env_prefix, environment variables)
+_LAYERED_CONFIGS: Dict[Tuple[Any, ...], Tuple[Any, Any]] = OrderedDict()
+_LAYERED_LOCK = threading.Lock()
+
+# Loaded env files by path: mtime_ns
+_ENV_FILES: Dict[str, int] = {}
+
+# Environment variables by prefix: (count of all variables, names, values)
+_ENV_SNAPSHOTS: Dict[str, Tuple[int, Tuple[str, ...], Tuple[str, ...]]] = {}
+
+
+def _find_config(filename: str, level: int) -> str:
+    path_cfg = _CONFIG_PATHS.get((filename, level))
+    if path_cfg is None:
+        path_cfg = pathlib.Path(os.path.abspath(filename))
+
+        for i in range(level):
+            path_cfg = path_cfg.parent
+
+        path_cfg = path_cfg.resolve()
+        path_cfg = os.path.join(path_cfg, "config.json")
+        _CONFIG_PATHS[(filename, level)] = path_cfg
+    return path_cfg
+
+
+def _parse_env_value(value: str) -> Any:
+    try:
+        return loads(value)
+    except ValueError:
+        return value
+
+
+def _merge(config: dict, overrides: dict) -> dict:
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            _merge(config[key], value)
+        else:
+            config[key] = value
+    return config
+
+
+def get_env_overrides(prefix: str) -> dict:
+    """
+    Get config overrides from environment variables with prefix.
+
+    Nested keys are separated by "__" and matched to keys of config case-insensitively by `load_config`,
+    values are parsed as json if possible: `VARVARA_DB__PORT=5432` -> `{"db": {"port": 5432}}`.
+
+    Args
+    ----------
+        `prefix` : prefix of environment variables, for example "VARVARA_".
+
+    Return
+    ----------
+        `dict` : overrides.
+    """
+    overrides = {}
+    for name, value in os.environ.items():
+        if not name.startswith(prefix) or name == prefix:
+            continue
+        *parents, key = name[len(prefix) :].lower().split("__")
+        node = overrides
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = _parse_env_value(value)
+    return overrides
+
+
+def _match_keys(config: dict, overrides: dict) -> dict:
+    # map lowercased keys of environment overrides to existing keys of config
+    keys = {str(key).lower(): key for key in config}
+    matched = {}
+    for key, value in overrides.items():
+        key = keys.get(key, key)
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            value = _match_keys(config[key], value)
+        matched[key] = value
+    return matched
+
+
+def _snapshot(data: Any) -> Any:
+    # hashable snapshot of json data
+    if isinstance(data, dict):
+        return frozenset((key, _snapshot(value)) for key, value in data.items())
+    elif isinstance(data, (list, tuple)):
+        return tuple(_snapshot(value) for value in data)
+    return data
+
+
+def _load_env_file_once(path: str):
+    mtime = os.stat(path).st_mtime_ns
+    if _ENV_FILES.get(path) != mtime:
+        load_env_file(path, override=False)
+        _ENV_FILES[path] = mtime
+
+
+def _env_items(prefix: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # only variables with prefix are read, while count of all variables isn't changed
+    environ = os.environ
+    snapshot = _ENV_SNAPSHOTS.get(prefix)
+    if snapshot and snapshot[0] == len(environ):
+        names = snapshot[1]
+        return names, tuple(environ.get(name) for name in names)
+
+    names = tuple(sorted(name for name in environ if name.startswith(prefix)))
+    values = tuple(environ[name] for name in names)
+    _ENV_SNAPSHOTS[prefix] = (len(environ), names, values)
+    return names, values
+
+
+def clear_config_cache():
+    """
+    Clear cache of layered configs (see `load_config`), loaded env files and environment variables.
+
+    Changes of values of environment variables with prefix and of added or removed variables are
+    detected automatically, except of adding and removing variables at the same time.
+    """
+    with _LAYERED_LOCK:
+        _LAYERED_CONFIGS.clear()
+        _ENV_FILES.clear()
+        _ENV_SNAPSHOTS.clear()
+
+
+def _merge_layers(data: Any, defaults: dict, env_prefix: str) -> dict:
+    config = thaw(defaults) if defaults else {}
+    if data:
+        _merge(config, thaw(data))
+    if env_prefix:
+        _merge(config, _match_keys(config, get_env_overrides(env_prefix)))
+    return freeze(config)
+
+
+def _load_layered(
+    config: Union[str, dict],
+    defaults: dict = None,
+    env_file: str = None,
+    env_prefix: str = None,
+):
+    if env_file:
+        _load_env_file_once(env_file)
+
+    if isinstance(config, dict):
+        # dicts can be changed in place, so they are merged on each call
+        return _merge_layers(config, defaults, env_prefix)
+
+    # same object while file isn't changed
+    data = open_json(config, cached=True, frozen=True)
+    env = _env_items(env_prefix) if env_prefix else ()
+    key = (config, _snapshot(defaults), env_file, env_prefix, env)
+
+    with _LAYERED_LOCK:
+        entry = _LAYERED_CONFIGS.get(key)
+        if entry and entry[0] is data:
+            _LAYERED_CONFIGS.move_to_end(key)
+            return entry[1]
+
+        merged = _merge_layers(data, defaults, env_prefix)
+        _LAYERED_CONFIGS[key] = (data, merged)
+        while len(_LAYERED_CONFIGS) > MAX_LAYERED_CONFIGS:
+            _LAYERED_CONFIGS.popitem(last=False)
+    return merged
+
+
+def load_config(
+    config: Union[str, dict] = None,
+    level: int = 4,
+    cached: bool = False,
+    frozen: bool = False,
+    defaults: dict = None,
+    env_file: str = None,
+    env_prefix: str = None,
+):
     """
     Function for dynamic load config from config.json file in root of project.
 
@@ -20,31 +199,51 @@ def load_config(config: Union[str, dict] = None, level: int = 4):
 
         `level` (opt=4): level of module relatively config.json file. (0 for self config.json)
 
+        `cached` (opt=False): load config file through process-wide cache (`files.JSON_CACHE`),
+        revalidated by mtime and size of file.
+
+        `frozen` (opt=False): return shared read-only config from cache instead of copy.
+
+        `defaults` (opt): dict with default values of config, overridden by config file.
+
+        `env_file` (opt): path to .env file loaded into environment (see `files.load_env_file`),
+        without overriding already setted variables.
+
+        `env_prefix` (opt): prefix of environment variables overriding config (see `get_env_overrides`).
+
+    With `defaults`, `env_file` or `env_prefix` layers of config file are merged once into cached
+    read-only config (merged again only if config file, defaults or environment variables were changed,
+    see `clear_config_cache`). Env file is loaded once, while it isn't changed.
+    Layers of config dict are merged on each call.
+
     Return
     ----------
         `CONFIG` : dict data from config.json.
     """
+    layered = defaults is not None or env_file or env_prefix
+
     CONFIG = {}
     if config:
-        if type(config) == dict:
+        if layered and type(config) in (dict, str):
+            CONFIG = _load_layered(config, defaults, env_file, env_prefix)
+        elif type(config) == dict:
             CONFIG = config
         elif type(config) == str:
-            CONFIG = open_json(config)
+            CONFIG = open_json(config, cached=cached, frozen=frozen)
         else:
             raise TypeError(
                 "config param is a path (str) or dict with config for Varvara project!"
             )
     else:
-        path_cfg = pathlib.Path(os.path.abspath(inspect.stack()[1].filename))
-
-        for i in range(level):
-            path_cfg = path_cfg.parent
-
-        path_cfg = path_cfg.resolve()
-        path_cfg = os.path.join(path_cfg, "config.json")
-        CONFIG = open_json(path_cfg)
+        path_cfg = _find_config(sys._getframe(1).f_code.co_filename, level)
+        if layered:
+            CONFIG = _load_layered(path_cfg, defaults, env_file, env_prefix)
+        else:
+            CONFIG = open_json(path_cfg, cached=cached, frozen=frozen)
 
-    if not CONFIG or type(CONFIG) != dict:
+    if not CONFIG or not isinstance(CONFIG, dict):
         raise TypeError("Config should be specified!")
 
+    if layered and not frozen:
+        return thaw(CONFIG)
     return CONFIG
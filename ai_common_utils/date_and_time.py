@@ -3,6 +3,9 @@ Date and time utils.
 """
 
 import datetime
+from typing import Iterable, List
+
+TIME_FORMATS = ("srt", "vtt", "plain")
 
 
 def format_time(dt_time: datetime.timedelta):
@@ -17,14 +20,116 @@ def format_time(dt_time: datetime.timedelta):
     ----------
         `str` : time in H:M:S format.
     """
-    str_time = str(dt_time)
-    str_time = str_time.split(", ")[-1]
-    h, m, s = str_time.split(":")
+    m, s = divmod(dt_time.seconds, 60)
+    h, m = divmod(m, 60)
+
+    if dt_time.microseconds:
+        return f"{h:02d}:{m:02d}:{s:02d}.{dt_time.microseconds // 1000:03d}"
+
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+def format_seconds(seconds: float, fmt: str = "srt") -> str:
+    """
+    Format time in seconds as timestamp.
+
+    Args
+    ----------
+        `seconds` : time in seconds (negative time formatted as 0).
+
+        `fmt` (opt="srt"): format of timestamp:
+
+        "srt" - `HH:MM:SS,mmm`
+
+        "vtt" - `HH:MM:SS.mmm`
+
+        "plain" - `HH:MM:SS`
+
+    Return
+    ----------
+        `str` : timestamp.
+    """
+    ms = int(seconds * 1000 + 0.5) if seconds > 0 else 0
 
-    if len(h) == 1:
-        h = "0" + h
+    if fmt == "srt":
+        return "%02d:%02d:%02d,%03d" % (
+            ms // 3600000,
+            ms // 60000 % 60,
+            ms // 1000 % 60,
+            ms % 1000,
+        )
+    elif fmt == "vtt":
+        return "%02d:%02d:%02d.%03d" % (
+            ms // 3600000,
+            ms // 60000 % 60,
+            ms // 1000 % 60,
+            ms % 1000,
+        )
+    elif fmt == "plain":
+        return "%02d:%02d:%02d" % (ms // 3600000, ms // 60000 % 60, ms // 1000 % 60)
+    else:
+        raise ValueError(f"fmt should be one of {TIME_FORMATS}!")
 
-    if "." in s or "," in s:
-        s = s[:-3]
 
-    return f"{h}:{m}:{s}"
+def format_seconds_batch(seconds: Iterable[float], fmt: str = "srt") -> List[str]:
+    """
+    Format times in seconds as timestamps at once (vectorized with numpy).
+
+    Args
+    ----------
+        `seconds` : times in seconds (list or np.ndarray).
+
+        `fmt` (opt="srt"): format of timestamps (see `format_seconds`).
+
+    Return
+    ----------
+        `List[str]` : timestamps.
+    """
+    import numpy as np
+
+    if fmt not in TIME_FORMATS:
+        raise ValueError(f"fmt should be one of {TIME_FORMATS}!")
+
+    ms = np.floor(np.asarray(seconds, dtype=np.float64).reshape(-1) * 1000 + 0.5)
+    ms = np.maximum(ms, 0).astype(np.int64)
+
+    if ms.size and ms.max() >= 100 * 3600 * 1000:
+        return [format_seconds(t / 1000, fmt) for t in ms.tolist()]
+
+    s, ms = np.divmod(ms, 1000)
+    m, s = np.divmod(s, 60)
+    h, m = np.divmod(m, 60)
+
+    width = 8 if fmt == "plain" else 12
+    chars = np.empty((ms.size, width), dtype=np.uint8)
+    for i, (value, sep) in enumerate([(h, b":"), (m, b":"), (s, None)]):
+        chars[:, i * 3] = value // 10 + 48
+        chars[:, i * 3 + 1] = value % 10 + 48
+        if sep:
+            chars[:, i * 3 + 2] = ord(sep)
+
+    if fmt != "plain":
+        chars[:, 8] = ord("," if fmt == "srt" else ".")
+        chars[:, 9] = ms // 100 + 48
+        chars[:, 10] = ms // 10 % 10 + 48
+        chars[:, 11] = ms % 10 + 48
+
+    return chars.view(f"S{width}").reshape(-1).astype(f"U{width}").tolist()
+
+
+def parse_seconds(timestamp: str) -> float:
+    """
+    Parse timestamp (`HH:MM:SS,mmm`, `HH:MM:SS.mmm`, `MM:SS.mmm` or `HH:MM:SS`) to seconds.
+
+    Args
+    ----------
+        `timestamp` : timestamp.
+
+    Return
+    ----------
+        `float` : time in seconds.
+    """
+    seconds = 0.0
+    for part in timestamp.strip().replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
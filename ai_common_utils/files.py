@@ -2,21 +2,513 @@
 Files utils.
 """
 
+import atexit
 import base64
+import binascii
+import bz2
+import codecs
+import glob
+import gzip
 import io
+import logging
+import lzma
+import mmap
 import os
 import json
+import queue
+import re
+import shutil
+import struct
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
 from os.path import exists, join
-from typing import Any, List, Union
+from typing import IO, Any, Callable, Iterable, Iterator, List, Tuple, Union
 
-try:
-    from .rttm import str2list, list2str
-except ImportError:
-    pass
+from .json import loads, dumps
+from .profiler import add_bytes, profile
+
+COMPRESSIONS = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+
+def open_file(
+    path: str, mode: str = "rb", compresslevel: int = 6, encoding: str = None
+) -> IO:
+    """
+    Open file, transparently compressed or decompressed (streaming) by extension:
+    `.gz` (gzip), `.bz2` (bzip2), `.xz` (lzma), other extensions - plain file.
+
+    Args
+    ----------
+        `path` : path to file.
+
+        `mode` (opt="rb"): mode of opening ("rb", "wb", "ab", "rt", "wt", "at").
+
+        `compresslevel` (opt=6): compression level (1-9) for writing.
+
+        `encoding` (opt): encoding for text mode.
+
+    Return
+    ----------
+        `IO` : opened file object.
+    """
+    codec = COMPRESSIONS.get(os.path.splitext(path)[1])
+
+    if not codec:
+        return open(path, mode.replace("t", ""), encoding=encoding)
+    elif "r" in mode:
+        return codec.open(path, mode, encoding=encoding)
+    elif codec is lzma:
+        return lzma.open(path, mode, preset=compresslevel, encoding=encoding)
+    return codec.open(path, mode, compresslevel=compresslevel, encoding=encoding)
+
+
+def _recompress_file(path_src: str, path_dst: str, compresslevel: int):
+    path_tmp = f"{path_dst}.tmp{os.path.splitext(path_dst)[1]}"
+    with open_file(path_src, "rb") as f_src, open_file(
+        path_tmp, "wb", compresslevel
+    ) as f_dst:
+        shutil.copyfileobj(f_src, f_dst, 1 << 20)
+    os.replace(path_tmp, path_dst)
+
+
+def recompress_files(
+    path_dir: str,
+    suffix: str = ".gz",
+    pattern: str = "**/*.json*",
+    compresslevel: int = 6,
+    workers: int = None,
+    remove_source: bool = True,
+) -> List[str]:
+    """
+    Recompress (compress or decompress) files in directory in parallel processes.
+
+    Args
+    ----------
+        `path_dir` : path to directory.
+
+        `suffix` (opt=".gz"): new compression suffix (".gz", ".bz2", ".xz" or "" for decompression).
+
+        `pattern` (opt="**/*.json*"): glob pattern of files relatively `path_dir`.
+
+        `compresslevel` (opt=6): compression level (1-9).
+
+        `workers` (opt): count of processes (default count of CPUs).
+
+        `remove_source` (opt=True): remove source files.
+
+    Return
+    ----------
+        `List[str]` : paths to new files.
+    """
+    if suffix and suffix not in COMPRESSIONS:
+        raise ValueError(f"suffix should be one of {list(COMPRESSIONS)} or ''!")
+
+    tasks = []
+    for path_src in sorted(glob.glob(join(path_dir, pattern), recursive=True)):
+        base, ext = os.path.splitext(path_src)
+        path_dst = (base if ext in COMPRESSIONS else path_src) + suffix
+        if path_dst != path_src and os.path.isfile(path_src):
+            tasks.append((path_src, path_dst))
+
+    if tasks:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as executor:
+            list(
+                executor.map(
+                    _recompress_file,
+                    [path_src for path_src, _ in tasks],
+                    [path_dst for _, path_dst in tasks],
+                    [compresslevel] * len(tasks),
+                )
+            )
+
+    if remove_source:
+        for path_src, _ in tasks:
+            os.remove(path_src)
+
+    return [path_dst for _, path_dst in tasks]
+
+
+class BackgroundWriter:
+    """
+    Write files in background thread, so caller only serializes data.
+
+    Files are written atomically (temp file in the same directory + rename) and
+    compressed by extension (see `open_file`). Queue of writes is bounded: `submit`
+    blocks when it is full. All queued writes are flushed on `close` (and at exit).
+    Errors of writes are set to their futures and the first one since last flush
+    is raised from `flush` (and `close`).
+
+    Args
+    ----------
+        `max_queue` (opt=64): max count of queued writes.
+
+        `fsync` (opt="never"): fsync policy:
+
+        "never" - rely on OS,
+
+        "always" - fsync each file (and directory) before returning result,
+
+        "flush" - fsync files written since last `flush` on `flush` or `close`.
+    """
+
+    FSYNC_POLICIES = ("never", "always", "flush")
+
+    def __init__(self, max_queue: int = 64, fsync: str = "never") -> None:
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"fsync should be one of {self.FSYNC_POLICIES}!")
+
+        self.fsync = fsync
+        self._queue = queue.Queue(max_queue)
+        self._written = []
+        self._errors = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._worker, name="BackgroundWriter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(
+        self, path: str, data: Union[bytes, str], compresslevel: int = 6
+    ) -> Future:
+        """
+        Queue data to be written to file.
+
+        Args
+        ----------
+            `path` : path to file.
+
+            `data` : data to write (str encoded in utf-8).
+
+            `compresslevel` (opt=6): compression level for `.gz`, `.bz2`, `.xz` files.
+
+        Return
+        ----------
+            `Future` : future with path to written file as result.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BackgroundWriter is closed!")
+            future = Future()
+            self._queue.put((future, path, data, compresslevel))
+        return future
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                if type(task) == Future:
+                    try:
+                        self._fsync_written()
+                        task.set_result(None)
+                    except BaseException as e:
+                        task.set_exception(e)
+                    continue
+
+                future, path, data, compresslevel = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    self._write(path, data, compresslevel)
+                    future.set_result(path)
+                except BaseException as e:
+                    self._errors.append(e)
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: str, data: Union[bytes, str], compresslevel: int):
+        if type(data) == str:
+            data = data.encode("utf-8")
+
+        dir_name, file_name = os.path.split(os.path.abspath(path))
+        path_tmp = join(
+            dir_name,
+            f".{file_name}.{uuid.uuid4().hex}.tmp{os.path.splitext(path)[1]}",
+        )
+        try:
+            with open_file(path_tmp, "wb", compresslevel) as f:
+                f.write(data)
+            if self.fsync == "always":
+                _fsync_path(path_tmp)
+            os.replace(path_tmp, path)
+        except BaseException:
+            if exists(path_tmp):
+                os.remove(path_tmp)
+            raise
+
+        if self.fsync == "always":
+            _fsync_path(dir_name, directory=True)
+        elif self.fsync == "flush":
+            self._written.append(path)
+
+    def _fsync_written(self):
+        written, self._written = self._written, []
+        for path in written:
+            _fsync_path(path)
+        for dir_name in set(os.path.dirname(os.path.abspath(p)) for p in written):
+            _fsync_path(dir_name, directory=True)
+
+    def flush(self, timeout: float = None):
+        """
+        Wait until all queued writes are done (and fsynced with "flush" policy),
+        raise first error of writes since last flush.
+
+        Args
+        ----------
+            `timeout` (opt): timeout in seconds.
+        """
+        if self._thread.is_alive():
+            future = Future()
+            self._queue.put(future)
+            future.result(timeout)
+        errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """
+        Flush queued writes and stop background thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _fsync_path(path: str, directory: bool = False):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # directories can't be opened on some OS
+    try:
+        os.fsync(fd)
+    except OSError:
+        if not directory:
+            raise
+    finally:
+        os.close(fd)
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict (see `freeze`). Deep copy of it is usual mutable dict.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only!")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(data: Any) -> Any:
+    """
+    Get read-only view of json data (dicts to `FrozenDict`, lists to tuples).
+    """
+    if isinstance(data, dict):
+        return FrozenDict((key, freeze(value)) for key, value in data.items())
+    elif isinstance(data, (list, tuple)):
+        return tuple(freeze(value) for value in data)
+    return data
+
+
+def thaw(data: Any) -> Any:
+    """
+    Get mutable deep copy of frozen json data (see `freeze`).
+    """
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    elif isinstance(data, (list, tuple)):
+        return [thaw(value) for value in data]
+    return data
+
+
+class JsonCache:
+    """
+    Process-wide cache of loaded json files.
+
+    Entries are keyed by absolute path and revalidated by `os.stat` (mtime_ns and size)
+    on each `get`, count of entries is bounded with LRU eviction. Optional `watch` thread
+    reloads changed files and calls reload callbacks.
+
+    Args
+    ----------
+        `maxsize` (opt=128): max count of cached files.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # path: (stat, raw bytes, frozen data)
+        self._callbacks = []
+        self._lock = threading.RLock()
+        self._watch_stop = None
+
+    def _load(self, path: str, stat: Tuple[int, int]):
+        with open_file(path, "rb") as f:
+            raw = f.read()
+        entry = (stat, raw, freeze(loads(raw)))
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, path: str, frozen: bool = False) -> Any:
+        """
+        Get data of json file.
+
+        Args
+        ----------
+            `path` : path to json file.
+
+            `frozen` (opt=False): True - return shared read-only view (see `freeze`),
+            False - return new mutable deep copy.
+
+        Return
+        ----------
+            `Any` : loaded data.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stat = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == stat:
+                self._entries.move_to_end(path)
+            else:
+                entry = None
+
+        if not entry:
+            entry = self._load(path, stat)
+
+        # Parsing cached bytes is faster than deepcopy of data
+        return entry[2] if frozen else loads(entry[1])
+
+    def invalidate(self, path: str = None):
+        """
+        Remove file (or all files, if path not provided) from cache.
+        """
+        with self._lock:
+            if path:
+                self._entries.pop(os.path.abspath(path), None)
+            else:
+                self._entries.clear()
+
+    def add_reload_callback(self, func: Callable[[str, Any], Any]):
+        """
+        Add function called as `func(path, frozen_data)` after cached file reloaded by `watch`.
+        """
+        self._callbacks.append(func)
+
+    def remove_reload_callback(self, func: Callable[[str, Any], Any]):
+        self._callbacks.remove(func)
+
+    def check(self) -> List[str]:
+        """
+        Reload changed cached files and call reload callbacks
+        (errors of reload and callbacks are logged).
+
+        Return
+        ----------
+            `List[str]` : paths of reloaded files.
+        """
+        with self._lock:
+            entries = [(path, entry[0]) for path, entry in self._entries.items()]
+
+        reloaded = []
+        for path, stat in entries:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self.invalidate(path)
+                continue
+            if (st.st_mtime_ns, st.st_size) != stat:
+                try:
+                    entry = self._load(path, (st.st_mtime_ns, st.st_size))
+                except ValueError:
+                    continue  # file is being written, try on next check
+                except Exception:
+                    logging.exception(f"JsonCache: can't reload {path}")
+                    continue
+                reloaded.append(path)
+                for func in list(self._callbacks):
+                    try:
+                        func(path, entry[2])
+                    except Exception:
+                        logging.exception(
+                            f"JsonCache: reload callback of {path} failed"
+                        )
+        return reloaded
+
+    def watch(self, interval: float = 1.0):
+        """
+        Start thread for hot reload of changed cached files (see `check`).
+
+        Args
+        ----------
+            `interval` (opt=1.0): interval in seconds between checks.
+        """
+        if self._watch_stop:
+            return
+        self._watch_stop = threading.Event()
+
+        def watcher(stop: threading.Event):
+            while not stop.wait(interval):
+                try:
+                    self.check()
+                except Exception:
+                    logging.exception("JsonCache: check failed")
+
+        threading.Thread(
+            target=watcher, args=(self._watch_stop,), name="JsonCache", daemon=True
+        ).start()
+
+    def stop_watch(self):
+        if self._watch_stop:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+
+JSON_CACHE = JsonCache()
 
 
 def open_json(
-    file_name: str, path_save: str = None, create_if_not_exist: bool = False
+    file_name: str,
+    path_save: str = None,
+    create_if_not_exist: bool = False,
+    cached: bool = False,
+    frozen: bool = False,
 ) -> Union[dict, None]:
     """
     Open and read data from json file.
@@ -29,6 +521,10 @@ def open_json(
         Path to json file.
     create_if_not_exist: str
         Create json file if not exist.
+    cached: bool
+        Use process-wide cache `JSON_CACHE`, revalidated by mtime and size of file.
+    frozen: bool
+        Return shared read-only view from cache (see `freeze`) instead of copy.
 
     Returns
     -------
@@ -41,17 +537,29 @@ def open_json(
         path_save = join(path_save, file_name)
 
     if exists(path_save):
-        return json.loads(open(path_save, "r", encoding="utf8").read())
+        if cached or frozen:
+            return JSON_CACHE.get(path_save, frozen)
+        with open_file(path_save, "rb") as f:
+            return loads(f.read())
 
     elif create_if_not_exist:
-        open(path_save, "w").write(json.dumps({}))
+        with open_file(path_save, "wb") as f:
+            f.write(b"{}")
         return None
 
     else:
         return None
 
 
-def save_json(file_name: str, file_data: dict, path_save: str = None):
+@profile()
+def save_json(
+    file_name: str,
+    file_data: dict,
+    path_save: str = None,
+    pretty: bool = True,
+    compresslevel: int = 6,
+    writer: BackgroundWriter = None,
+) -> Union[Future, None]:
     """
     Open and save json data to json file.
 
@@ -64,19 +572,148 @@ def save_json(file_name: str, file_data: dict, path_save: str = None):
 
         path_save (str):
             Path to save without file name.
+
+        pretty (bool):
+            True - indented json with sorted keys, False - compact json.
+
+        compresslevel (int):
+            Compression level for `.gz`, `.bz2`, `.xz` files.
+
+        writer (BackgroundWriter):
+            Write file in background (only serialization done in caller thread).
+
+    Returns:
+        future (Future):
+            Future of background write, if `writer` provided.
     """
     if not path_save:
         path_save = file_name
     else:
         path_save = join(path_save, file_name)
 
-    with open(path_save, "w", encoding="utf8") as json_file:
-        json_file.write(
-            json.dumps(file_data, indent=4, sort_keys=True, ensure_ascii=False)
-        )
+    data = dumps(file_data, pretty)
+    add_bytes(len(data))
+
+    if writer:
+        return writer.submit(path_save, data, compresslevel)
+
+    with open_file(path_save, "wb", compresslevel) as json_file:
+        json_file.write(data)
+
+
+def iter_jsonl(path: str, start: int = 0, end: int = None) -> Iterator[Any]:
+    """
+    Iterate over records of JSON Lines file (one json per line).
+
+    For parallel reading file can be split by byte ranges (see `split_jsonl`):
+    reader starts at the first line beginning at or after `start`
+    and reads lines beginning before `end`.
+
+    Args
+    ----------
+        `path` : path to JSON Lines file (may be compressed, see `open_file`).
+
+        `start` (opt=0): byte offset of range (only for not compressed files).
+
+        `end` (opt): byte offset of end of range (only for not compressed files).
+
+    Return
+    ----------
+        `Iterator[Any]` : loaded records.
+    """
+    if (start or end is not None) and os.path.splitext(path)[1] in COMPRESSIONS:
+        raise ValueError("Byte ranges are not supported for compressed files!")
 
+    with open_file(path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            if f.read(1) != b"\n":
+                f.readline()  # skip line started in previous range
 
-def save_list_rttm(file_name: str, rttm: list, path_save: str = None):
+        pos = f.tell()
+        for line in f:
+            if end is not None and pos >= end:
+                break
+            pos += len(line)
+            if line.strip():
+                yield loads(line)
+
+
+def open_jsonl(path: str) -> List[Any]:
+    """
+    Open and read all records from JSON Lines file.
+
+    Args
+    ----------
+        `path` : path to JSON Lines file (may be compressed, see `open_file`).
+
+    Return
+    ----------
+        `List[Any]` : loaded records.
+    """
+    return list(iter_jsonl(path))
+
+
+def append_jsonl(path: str, records: Iterable[Any], compresslevel: int = 6):
+    """
+    Append records to JSON Lines file without rewriting it (file created if not exist).
+
+    Args
+    ----------
+        `path` : path to JSON Lines file (may be compressed, see `open_file`).
+
+        `records` : records to append.
+
+        `compresslevel` (opt=6): compression level for `.gz`, `.bz2`, `.xz` files.
+    """
+    with open_file(path, "ab", compresslevel) as f:
+        for record in records:
+            f.write(dumps(record) + b"\n")
+
+
+def save_jsonl(path: str, records: Iterable[Any], compresslevel: int = 6):
+    """
+    Save records to JSON Lines file (file rewritten).
+
+    Args
+    ----------
+        `path` : path to JSON Lines file (may be compressed, see `open_file`).
+
+        `records` : records to save.
+
+        `compresslevel` (opt=6): compression level for `.gz`, `.bz2`, `.xz` files.
+    """
+    with open_file(path, "wb", compresslevel) as f:
+        for record in records:
+            f.write(dumps(record) + b"\n")
+
+
+def split_jsonl(path: str, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split JSON Lines file by byte ranges into shards for parallel readers (see `iter_jsonl`).
+
+    Args
+    ----------
+        `path` : path to not compressed JSON Lines file.
+
+        `n_shards` : count of shards.
+
+    Return
+    ----------
+        `List[Tuple[int, int]]` : (start, end) byte ranges.
+    """
+    size = os.path.getsize(path)
+    bounds = [size * i // n_shards for i in range(n_shards + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def save_list_rttm(
+    file_name: str,
+    rttm: list,
+    path_save: str = None,
+    compresslevel: int = 6,
+    writer: BackgroundWriter = None,
+) -> Union[Future, None]:
     """
     Open and save rttm list data to text-like file.
 
@@ -87,14 +724,27 @@ def save_list_rttm(file_name: str, rttm: list, path_save: str = None):
         `rttm` : list rttm data.
 
         `path_save` (opt): path to file to save without file name.
+
+        `compresslevel` (opt=6): compression level for `.gz`, `.bz2`, `.xz` files.
+
+        `writer` (opt): write file in background (see `BackgroundWriter`).
+
+    Return
+    ----------
+        `Future` : future of background write, if `writer` provided.
     """
     if not path_save:
         path_save = file_name
     else:
         path_save = join(path_save, file_name)
 
+    from .rttm import list2str
+
     str_rttm = list2str(rttm)
-    with open(path_save, "w") as f:
+    if writer:
+        return writer.submit(path_save, str_rttm, compresslevel)
+
+    with open_file(path_save, "wt", compresslevel) as f:
         f.write(str_rttm)
 
 
@@ -121,14 +771,16 @@ def open_list_rttm(
     else:
         path_save = join(path_save, file_name)
 
+    from .rttm import str2list
+
     if exists(path_save):
         str_rttm = ""
-        with open(path_save, "r") as f:
+        with open_file(path_save, "rt") as f:
             str_rttm = f.read()
         return str2list(str_rttm)
 
     elif create_if_not_exist:
-        with open(path_save, "w") as f:
+        with open_file(path_save, "wt") as f:
             f.write("")
         return None
 
@@ -159,6 +811,10 @@ def load_env_file(dotenv_path, override=True):
 def check_file(file: Any):
     if type(file) == io.BytesIO:
         return io.BytesIO(file.getvalue())
+    elif type(file) == mmap.mmap:
+        # memory map is read from start, as new file (e.g. cached audio)
+        file.seek(0)
+        return file
     else:
         return file
 
@@ -181,3 +837,242 @@ def convert_to(data: Any, convert: List[str]):
             elif conv_type == "json":
                 data = json.dumps(data)
     return data
+
+
+STREAM_CONVERTS = ("base64", "json", "frame")
+
+# Complete part of JSON string: high surrogate escape is matched only with following low surrogate
+# escape (or, if it's lone, with following complete character), so pair isn't split between parts
+_JSON_STRING_PART = re.compile(
+    r"""(?:[^"\\]|\\["\\/bfnrt]|\\u(?![dD][89abAB])[0-9a-fA-F]{4}"""
+    r"""|\\u[dD][89abAB][0-9a-fA-F]{2}(?:\\u[dD][c-fC-F][0-9a-fA-F]{2}"""
+    r"""|(?=[^\\]|\\[^u]|\\u(?![dD][c-fC-F])[0-9a-fA-F]{4})))*"""
+)
+_FRAME_HEADER = struct.Struct(">I")
+
+
+def _iter_source(data: Any, chunk_size: int) -> Iterator[Union[bytes, str]]:
+    if isinstance(data, (bytes, bytearray, memoryview, str)):
+        view = memoryview(data) if not isinstance(data, str) else data
+        for i in range(0, len(view), chunk_size):
+            yield view[i : i + chunk_size]
+    elif hasattr(data, "read"):
+        for chunk in iter(lambda: data.read(chunk_size), b""):
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from data
+
+
+def _iter_rechunk(chunks: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _iter_b64encode(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    rest = b""
+    for chunk in chunks:
+        if rest:
+            chunk = rest + bytes(chunk)
+        n = len(chunk) - len(chunk) % 3
+        rest = bytes(chunk[n:])
+        if n:
+            yield binascii.b2a_base64(chunk[:n], newline=False)
+    if rest:
+        yield binascii.b2a_base64(rest, newline=False)
+
+
+def _iter_b64decode(chunks: Iterable[Union[bytes, str]]) -> Iterator[bytes]:
+    rest = b""
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii")
+        chunk = rest + bytes(chunk).translate(None, b" \t\r\n")
+        n = len(chunk) - len(chunk) % 4
+        rest = chunk[n:]
+        if n:
+            yield base64.b64decode(chunk[:n])
+    if rest:
+        yield base64.b64decode(rest)
+
+
+def _iter_json_string_encode(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    yield b'"'
+    for chunk in chunks:
+        text = decoder.decode(chunk) if not isinstance(chunk, str) else chunk
+        if text:
+            yield json.encoder.encode_basestring_ascii(text)[1:-1].encode("ascii")
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield json.encoder.encode_basestring_ascii(text)[1:-1].encode("ascii")
+    yield b'"'
+
+
+def _iter_json_decode(chunks: Iterable[Union[bytes, str]]) -> Iterator[Any]:
+    """
+    Decode JSON string value as stream of utf-8 chunks, other JSON values as one object.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    # chunks of bytes-like input are memoryviews (see `_iter_source`)
+    chunks = (chunk if isinstance(chunk, str) else bytes(chunk) for chunk in chunks)
+    text = ""
+
+    for chunk in chunks:
+        text += decoder.decode(chunk) if not isinstance(chunk, str) else chunk
+        text = text.lstrip()
+        if text:
+            break
+
+    if not text.startswith('"'):
+        # Not string value: buffer and decode whole value
+        parts = [text]
+        for chunk in chunks:
+            parts.append(decoder.decode(chunk) if not isinstance(chunk, str) else chunk)
+        parts.append(decoder.decode(b"", final=True))
+        yield loads("".join(parts))
+        return
+
+    text = text[1:]
+    while True:
+        end = _JSON_STRING_PART.match(text).end()
+        if end:
+            yield json.loads(f'"{text[:end]}"').encode("utf-8")
+        text = text[end:]
+        if text.startswith('"'):
+            if text[1:].strip():
+                raise ValueError("Extra data after JSON string!")
+            for chunk in chunks:
+                if chunk.strip():
+                    raise ValueError("Extra data after JSON string!")
+            return
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("Unterminated JSON string!")
+        text += decoder.decode(chunk) if not isinstance(chunk, str) else chunk
+
+
+def _iter_frames_encode(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    for chunk in chunks:
+        if len(chunk):
+            yield _FRAME_HEADER.pack(len(chunk))
+            yield chunk
+    yield _FRAME_HEADER.pack(0)
+
+
+def _iter_frames_decode(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    buffer = bytearray()
+    need = None
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if need is None:
+                if len(buffer) < _FRAME_HEADER.size:
+                    break
+                (need,) = _FRAME_HEADER.unpack_from(buffer)
+                del buffer[: _FRAME_HEADER.size]
+                if need == 0:
+                    return
+            if len(buffer) < need:
+                break
+            yield bytes(buffer[:need])
+            del buffer[:need]
+            need = None
+    raise ValueError("Frames stream ended without terminating frame!")
+
+
+def iter_convert_to(
+    data: Any, convert: List[str], chunk_size: int = 1 << 20
+) -> Iterator[bytes]:
+    """
+    Streaming version of `convert_to`: encode data incrementally with bounded buffers.
+
+    Args
+    ----------
+        `data` : bytes, binary file object or iterator (not list) of bytes chunks
+        (any json-serializable object, if first convert is "json").
+
+        `convert` : chain of converts:
+
+        "base64" - base64 encoding,
+
+        "json" - JSON encoding (stream is encoded as JSON string),
+
+        "frame" - binary framing (length-prefixed chunks) instead of base64 for binary transports.
+
+        `chunk_size` (opt=1MB): size of chunks read from data.
+
+    Return
+    ----------
+        `Iterator[bytes]` : encoded chunks.
+    """
+    if (
+        convert
+        and convert[0] == "json"
+        and not isinstance(data, (bytes, bytearray, memoryview, str, Iterator))
+        and not hasattr(data, "read")
+    ):
+        chunks = _iter_rechunk(
+            (part.encode("utf-8") for part in json.JSONEncoder().iterencode(data)),
+            chunk_size,
+        )
+        convert = convert[1:]
+    else:
+        chunks = _iter_source(data, chunk_size)
+
+    for conv_type in convert:
+        if conv_type == "base64":
+            chunks = _iter_b64encode(chunks)
+        elif conv_type == "json":
+            chunks = _iter_json_string_encode(chunks)
+        elif conv_type == "frame":
+            chunks = _iter_frames_encode(chunks)
+        else:
+            raise ValueError(f"convert should be one of {STREAM_CONVERTS}!")
+
+    return chunks
+
+
+def iter_convert_from(
+    data: Any, convert: List[str], chunk_size: int = 1 << 20
+) -> Iterator[Any]:
+    """
+    Streaming version of `convert_from`: decode data incrementally with bounded buffers.
+
+    Args
+    ----------
+        `data` : bytes, str, file object or iterator of chunks.
+
+        `convert` : chain of converts (see `iter_convert_to`). JSON string values are decoded
+        as stream of utf-8 chunks, other JSON values are decoded at once and should be last in chain.
+
+        `chunk_size` (opt=1MB): size of chunks read from data.
+
+    Return
+    ----------
+        `Iterator[Any]` : decoded bytes chunks (or one decoded JSON object).
+    """
+    chunks = _iter_source(data, chunk_size)
+
+    for conv_type in convert:
+        if conv_type == "base64":
+            chunks = _iter_b64decode(chunks)
+        elif conv_type == "json":
+            chunks = _iter_json_decode(chunks)
+        elif conv_type == "frame":
+            chunks = _iter_frames_decode(chunks)
+        else:
+            raise ValueError(f"convert should be one of {STREAM_CONVERTS}!")
+
+    return chunks
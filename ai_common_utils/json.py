@@ -1,39 +1,334 @@
 """
 JSON utils.
+
+Serialization uses fastest installed backend: `orjson`, `ujson` or stdlib `json`
+(see `set_json_backend`). No backend is required.
 """
 
+import base64
 import json
-import logging
-from typing import Any
+import sys
+from functools import partial
+from typing import Any, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
-    import numpy as np
+    import ujson
+except ImportError:
+    ujson = None
 
-    class NumpyEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, np.ndarray):
-                return obj.tolist()
-            if isinstance(obj, float):
-                return str(obj)
-            return json.JSONEncoder.default(self, obj)
 
-except ImportError:
-    logging.error("Numpy not installed. json.NumpyEncoder not allowed!")
+JSON_BACKENDS = ("orjson", "ujson", "json")
+
+_backend = "orjson" if orjson else "ujson" if ujson else "json"
+
+_INF = float("inf")
+
+
+class NumpyEncoder(json.JSONEncoder):
+    """
+    JSON encoder for numpy arrays and scalars (np.float32, np.int64, np.bool_, etc.).
+
+    Arrays are converted at once with `tolist`. Arrays with size not less than `binary_threshold`
+    are encoded as base64 packed binary `{"__ndarray__": str, "dtype": str, "shape": list}`
+    (decoded back with `numpy_object_hook`).
+
+    Parameters
+    ----------
+    binary_threshold: int
+        Min size of array for binary encoding. None - never.
+    """
+
+    def __init__(self, *args, binary_threshold: int = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.binary_threshold = binary_threshold
+
+    def default(self, obj):
+        result = _numpy_default(obj, self.binary_threshold)
+        if result is not obj:
+            return result
+        return json.JSONEncoder.default(self, obj)
+
+
+def _numpy_default(obj: Any, binary_threshold: int = None) -> Any:
+    """
+    Convert numpy array or scalar to json-serializable value (obj returned as is if not numpy).
+    """
+    # numpy objects exist only if numpy already imported, so don't import it here
+    np = sys.modules.get("numpy")
+    if np is None:
+        return obj
+
+    if isinstance(obj, np.ndarray):
+        if binary_threshold is not None and obj.size >= binary_threshold:
+            return {
+                "__ndarray__": base64.b64encode(np.ascontiguousarray(obj)).decode(
+                    "ascii"
+                ),
+                "dtype": obj.dtype.str,
+                "shape": list(obj.shape),
+            }
+        return obj.tolist()
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def numpy_object_hook(obj: dict) -> Any:
+    """
+    Object hook for `json.loads` decoding arrays encoded by `NumpyEncoder` with `binary_threshold`.
+    """
+    if "__ndarray__" in obj:
+        import numpy as np
+
+        return np.frombuffer(
+            bytearray(base64.b64decode(obj["__ndarray__"])), dtype=obj["dtype"]
+        ).reshape(obj["shape"])
+    return obj
+
+
+def _decode_ndarrays(data: Any) -> Any:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            data[key] = _decode_ndarrays(value)
+        return numpy_object_hook(data)
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            data[i] = _decode_ndarrays(value)
+    return data
+
+
+def get_json_backend() -> str:
+    """
+    Get name of used JSON backend.
+
+    Returns
+    -------
+    backend: str
+        "orjson", "ujson" or "json".
+    """
+    return _backend
+
+
+def set_json_backend(backend: str = None):
+    """
+    Set JSON backend.
+
+    Parameters
+    ----------
+    backend: str
+        "orjson", "ujson" or "json". None - fastest installed.
+    """
+    global _backend
+
+    if backend is None:
+        backend = "orjson" if orjson else "ujson" if ujson else "json"
+    elif backend not in JSON_BACKENDS:
+        raise ValueError(f"backend should be one of {JSON_BACKENDS}!")
+    elif (backend == "orjson" and not orjson) or (backend == "ujson" and not ujson):
+        raise ImportError(f"{backend} not installed!")
+
+    _backend = backend
+
 
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize JSON from str or bytes.
 
-def open_json(path: str):
-    return json.loads(open(path, "r", encoding="utf8").read())
+    Documents that fast backend can't decode (for example with NaN or Infinity,
+    written by stdlib `json`) are decoded by stdlib `json`.
 
+    Parameters
+    ----------
+    data: Union[str, bytes]
+        JSON document.
 
-def save_json(data: Any, path: str):
-    with open(path, "w", encoding="utf8") as json_file:
-        json_file.write(
-            json.dumps(
-                data,
-                indent=4,
-                sort_keys=True,
-                ensure_ascii=False,
-            )
+    Returns
+    -------
+    data: Any
+        Loaded data.
+    """
+    try:
+        if _backend == "orjson":
+            return orjson.loads(data)
+        elif _backend == "ujson":
+            return ujson.loads(data)
+    except ValueError:
+        pass
+    return json.loads(data)
+
+
+def _has_nonfinite(data: Any) -> bool:
+    """
+    Check if data has NaN or infinite floats, numpy scalars or arrays
+    (fast backends write them as null or fail).
+    """
+    np = sys.modules.get("numpy")
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if value != value or value in (_INF, -_INF):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif np is not None and isinstance(value, np.ndarray):
+            if value.dtype.kind in "fc" and not np.isfinite(value).all():
+                return True
+            if value.dtype.kind == "O":
+                stack.extend(value.ravel().tolist())
+        elif np is not None and isinstance(value, (np.floating, np.complexfloating)):
+            if not np.isfinite(value):
+                return True
+    return False
+
+
+def _dumps_orjson(data: Any, **kwargs) -> Union[bytes, None]:
+    """
+    Serialize data by orjson, None - if data should be serialized by stdlib `json`
+    (unsupported types, or NaN and infinite values, which orjson writes as null).
+    """
+    try:
+        result = orjson.dumps(data, **kwargs)
+    except (TypeError, OverflowError):
+        return None
+    if b"null" in result and _has_nonfinite(data):
+        return None
+    return result
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize data to JSON utf-8 bytes.
+
+    Pretty JSON and data with NaN or infinite floats are serialized by stdlib `json`
+    (as stdlib `json.dumps` does), other data - by fast backend.
+
+    Parameters
+    ----------
+    data: Any
+        Data to serialize.
+    pretty: bool
+        True - indented (4 spaces) with sorted keys.
+
+        False - compact.
+
+    Returns
+    -------
+    data: bytes
+        JSON document.
+    """
+    if not pretty:
+        if _backend == "orjson":
+            result = _dumps_orjson(data)
+            if result is not None:
+                return result
+        elif _backend == "ujson":
+            try:
+                return ujson.dumps(
+                    data, ensure_ascii=False, escape_forward_slashes=False
+                ).encode("utf-8")
+            except (TypeError, OverflowError):
+                # Types unsupported by ujson (non-str keys, big ints, NaN, etc.)
+                pass
+
+    if pretty:
+        return json.dumps(data, indent=4, sort_keys=True, ensure_ascii=False).encode(
+            "utf-8"
         )
-        json_file.close()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_numpy(data: Any, pretty: bool = False, binary_threshold: int = None) -> bytes:
+    """
+    Serialize data with numpy arrays and scalars to JSON utf-8 bytes (see `NumpyEncoder`).
+
+    Parameters
+    ----------
+    data: Any
+        Data to serialize.
+    pretty: bool
+        True - indented (4 spaces) with sorted keys, False - compact.
+    binary_threshold: int
+        Min size of array for base64 packed binary encoding. None - never.
+
+    Returns
+    -------
+    data: bytes
+        JSON document.
+    """
+    default = partial(_numpy_default, binary_threshold=binary_threshold)
+
+    if _backend == "orjson" and not pretty:
+        option = orjson.OPT_SERIALIZE_NUMPY if binary_threshold is None else 0
+        # numpy scalars and arrays with NaN or Infinity go through the same check as in `dumps`
+        result = _dumps_orjson(data, default=default, option=option)
+        if result is not None:
+            return result
+
+    if pretty:
+        return json.dumps(
+            data,
+            cls=NumpyEncoder,
+            binary_threshold=binary_threshold,
+            indent=4,
+            sort_keys=True,
+            ensure_ascii=False,
+        ).encode("utf-8")
+    return json.dumps(
+        data,
+        cls=NumpyEncoder,
+        binary_threshold=binary_threshold,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def loads_numpy(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize JSON with arrays encoded by `dumps_numpy` with `binary_threshold`.
+
+    Parameters
+    ----------
+    data: Union[str, bytes]
+        JSON document.
+
+    Returns
+    -------
+    data: Any
+        Loaded data with np.ndarray for binary encoded arrays.
+    """
+    if _backend == "json":
+        return json.loads(data, object_hook=numpy_object_hook)
+
+    result = loads(data)
+    marker = "__ndarray__" if isinstance(data, str) else b"__ndarray__"
+    return _decode_ndarrays(result) if marker in data else result
+
+
+def open_json(path: str, cached: bool = False, frozen: bool = False):
+    from .files import JSON_CACHE, open_file
+
+    if cached or frozen:
+        return JSON_CACHE.get(path, frozen)
+
+    with open_file(path, "rb") as json_file:
+        return loads(json_file.read())
+
+
+def save_json(
+    data: Any, path: str, pretty: bool = True, compresslevel: int = 6, writer=None
+):
+    from .files import open_file
+
+    if writer:
+        return writer.submit(path, dumps(data, pretty), compresslevel)
+
+    with open_file(path, "wb", compresslevel) as json_file:
+        json_file.write(dumps(data, pretty))
@@ -54,20 +54,23 @@ Replica format:
 import re
 import json
 from copy import deepcopy
-from typing import Any, List, Union
+from typing import Any, Iterable, Iterator, List, Union
 from uuid import uuid4
 
+from .profiler import profile
+
 try:
     from .rttm import str2list
 except ImportError:
     pass
 
 try:
-    from .files import open_json, save_json
+    from .files import open_json, save_json, iter_jsonl, append_jsonl, save_jsonl
 except ImportError:
     pass
 
 
+@profile()
 def rttm2jsr(rttm: Union[List[List[str]], str]):
     """
     Convert rttm to JSR.
@@ -95,10 +98,12 @@ def rttm2jsr(rttm: Union[List[List[str]], str]):
     ]
 
 
+@profile()
 def combine_asr_sdr(
     jsr_asr: Union[List[dict], str],
     jsr_sdr: Union[List[dict], str],
     path_save: str = None,
+    writer=None,
 ):
     """
     Combine JSR ASR with JSR SDR.
@@ -111,6 +116,8 @@ def combine_asr_sdr(
 
         `path_save` (opt): path to save combined JSR file
 
+        `writer` (opt): `files.BackgroundWriter` for saving file in background (errors are raised from `writer.flush`)
+
     Return
     ----------
         `JSR` : combined jsr
@@ -150,7 +157,7 @@ def combine_asr_sdr(
                     n += 1
 
     if path_save:
-        save_json(path_save, jsr_sdr)
+        save_json(path_save, jsr_sdr, writer=writer)
 
     jsr_sdr = [
         row
@@ -295,3 +302,70 @@ def remove_tokens_jsr(jsr: dict):
         {**replica, **{"speech": remove_keys_dict(replica["speech"], ["tokens"])}}
         for replica in jsr
     ]
+
+
+def jsr2jsonl(jsr: Iterable[dict], path_save: str, append: bool = True):
+    """
+    Save JSR replicas to JSON Lines file (one replica per line).
+
+    Args
+    ----------
+        `jsr` : JSR or any iterator of replicas.
+
+        `path_save` : path to JSON Lines file.
+
+        `append` (opt=True): append replicas to existing file instead of rewriting.
+    """
+    if append:
+        append_jsonl(path_save, jsr)
+    else:
+        save_jsonl(path_save, jsr)
+
+
+def iter_jsonl_jsr(path: str, start: int = 0, end: int = None) -> Iterator[dict]:
+    """
+    Iterate over JSR replicas of JSON Lines file (see `files.iter_jsonl` for byte ranges).
+
+    Args
+    ----------
+        `path` : path to JSON Lines file.
+
+        `start` (opt=0): byte offset of range.
+
+        `end` (opt): byte offset of end of range.
+
+    Return
+    ----------
+        `Iterator[dict]` : JSR replicas.
+    """
+    return iter_jsonl(path, start, end)
+
+
+def jsonl2jsr(path: str) -> List[dict]:
+    """
+    Open JSR saved as JSON Lines file.
+
+    Args
+    ----------
+        `path` : path to JSON Lines file.
+
+    Return
+    ----------
+        `JSR` : JSR file format.
+    """
+    return list(iter_jsonl(path))
+
+
+def save_solr_jsonl(jsr: List[dict], speech_idx: str, path_save: str):
+    """
+    Append JSR converted for Solr (see `convert_for_solr`) to JSON Lines file.
+
+    Args
+    ----------
+        `jsr` : JSR with replicas ids.
+
+        `speech_idx` : index of speech.
+
+        `path_save` : path to JSON Lines file.
+    """
+    append_jsonl(path_save, convert_for_solr(jsr, speech_idx))
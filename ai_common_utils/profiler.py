@@ -0,0 +1,319 @@
+"""
+Profiling utils.
+
+Opt-in instrumentation of pipeline stages: call counts, wall and CPU time, processed bytes
+and peak allocations (with `tracemalloc`). Disabled by default, then instrumented functions
+only check one global flag.
+
+    from ai_common_utils import profiler
+
+    profiler.enable(trace_memory=True)
+    with profiler.stage("decode"):
+        audio = get_audio("audio.mp3")  # recorded as "decode/audio.get_audio"
+    profiler.save_json("profile.json")
+    profiler.save_prometheus("profile.prom")
+"""
+
+import functools
+import json
+import os
+import threading
+import tracemalloc
+from time import perf_counter_ns, thread_time_ns
+from typing import Any, Callable, Dict, List, Tuple
+
+_enabled = False
+_trace_memory = False
+# tracemalloc was started by `enable` (and is stopped by `disable`)
+_started_tracemalloc = False
+_lock = threading.Lock()
+_local = threading.local()
+
+# Statistics of stages by path of stage names
+_stats: Dict[Tuple[str, ...], "StageStats"] = {}
+
+
+class StageStats:
+    """
+    Accumulated statistics of stage.
+    """
+
+    __slots__ = ("calls", "wall_time", "cpu_time", "bytes", "peak_memory")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.bytes = 0
+        self.peak_memory = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def enable(trace_memory: bool = False):
+    """
+    Enable profiling.
+
+    Args
+    ----------
+        `trace_memory` (opt=False): record peak allocations of stages with `tracemalloc` (slow).
+    """
+    global _enabled, _trace_memory, _started_tracemalloc
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _trace_memory = trace_memory
+    _enabled = True
+
+
+def disable():
+    """
+    Disable profiling (collected statistics are kept, see `reset`).
+    Tracing of allocations is stopped, only if it was started by `enable`.
+    """
+    global _enabled, _trace_memory, _started_tracemalloc
+    if _started_tracemalloc and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _started_tracemalloc = False
+    _enabled = False
+    _trace_memory = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """
+    Remove collected statistics.
+    """
+    with _lock:
+        _stats.clear()
+
+
+def _get_frames() -> list:
+    frames = getattr(_local, "frames", None)
+    if frames is None:
+        frames = _local.frames = []
+    return frames
+
+
+def current_stage() -> str:
+    """
+    Path of current stage in this thread, like "decode/audio.get_audio" ("" - outside of stages).
+    """
+    return "/".join(frame.path[-1] for frame in getattr(_local, "frames", ()))
+
+
+def add_bytes(n_bytes: int):
+    """
+    Add count of processed bytes to current stage.
+    """
+    if _enabled:
+        frames = getattr(_local, "frames", None)
+        if frames:
+            frames[-1].bytes += n_bytes
+
+
+def _call_callbacks(seconds: float, callbacks: List[Any]):
+    from .callback import call_callbacks
+
+    call_callbacks(seconds, callbacks)
+
+
+class stage:
+    """
+    Context manager (and decorator) that records statistics of stage. Stages are nested per thread.
+
+    Args
+    ----------
+        `name`: name of stage.
+
+        `callbacks` (opt): callbacks called with wall time of stage in seconds at its end
+        (for example `StopwatchCallback`), even if profiling is disabled.
+    """
+
+    __slots__ = (
+        "name",
+        "callbacks",
+        "path",
+        "bytes",
+        "peak_memory",
+        "_active",
+        "_wall",
+        "_cpu",
+        "_memory",
+    )
+
+    def __init__(self, name: str, callbacks: List[Any] = None) -> None:
+        self.name = name
+        self.callbacks = callbacks
+        self._active = False
+
+    def __enter__(self):
+        self._active = _enabled
+        if not self._active:
+            if self.callbacks:
+                self._wall = perf_counter_ns()
+            return self
+
+        frames = _get_frames()
+        self.path = (frames[-1].path if frames else ()) + (self.name,)
+        self.bytes = 0
+        self.peak_memory = 0
+        if _trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if frames:
+                frames[-1].peak_memory = max(frames[-1].peak_memory, peak)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self._memory = current
+        else:
+            self._memory = None
+        frames.append(self)
+
+        self._cpu = thread_time_ns()
+        self._wall = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self._active:
+            if self.callbacks:
+                _call_callbacks((perf_counter_ns() - self._wall) / 1e9, self.callbacks)
+            return
+
+        wall = perf_counter_ns() - self._wall
+        cpu = thread_time_ns() - self._cpu
+        frames = _get_frames()
+        frames.pop()
+
+        peak_memory = 0
+        if self._memory is not None and tracemalloc.is_tracing():
+            peak = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            peak_memory = max(peak - self._memory, 0)
+            if frames:
+                frames[-1].peak_memory = max(frames[-1].peak_memory, peak)
+
+        with _lock:
+            stats = _stats.get(self.path)
+            if stats is None:
+                stats = _stats[self.path] = StageStats()
+            stats.calls += 1
+            stats.wall_time += wall / 1e9
+            stats.cpu_time += cpu / 1e9
+            stats.bytes += self.bytes
+            stats.peak_memory = max(stats.peak_memory, peak_memory)
+
+        if self.callbacks:
+            _call_callbacks(wall / 1e9, self.callbacks)
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(self.name, self.callbacks):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def profile(name: str = None) -> Callable:
+    """
+    Decorator that records statistics of function as stage, if profiling is enabled.
+
+    Args
+    ----------
+        `name` (opt): name of stage. Default - "<module>.<function>".
+    """
+
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or "%s.%s" % (
+            func.__module__.rsplit(".", 1)[-1],
+            func.__qualname__,
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with stage(stage_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get flat statistics by path of stage ("decode/audio.get_audio").
+    """
+    with _lock:
+        return {"/".join(path): stats.to_dict() for path, stats in _stats.items()}
+
+
+def get_stage_tree() -> List[Dict[str, Any]]:
+    """
+    Get hierarchical view of stages: list of stage dicts with "name", statistics and "children".
+    """
+    with _lock:
+        items = sorted((path, stats.to_dict()) for path, stats in _stats.items())
+
+    roots = []
+    nodes = {}
+    for path, stats in items:
+        node = dict(name=path[-1], **stats, children=[])
+        nodes[path] = node
+        # parents are sorted before children
+        parent = nodes.get(path[:-1])
+        (parent["children"] if parent else roots).append(node)
+    return roots
+
+
+def _write(path: str, data: str):
+    # atomic write for readers of file (e.g. node_exporter textfile collector)
+    path_tmp = "%s.%d.tmp" % (path, os.getpid())
+    with open(path_tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(path_tmp, path)
+
+
+def save_json(path: str):
+    """
+    Save hierarchical view of stages (see `get_stage_tree`) to JSON file.
+    """
+    _write(path, json.dumps(get_stage_tree(), ensure_ascii=False, indent=4))
+
+
+PROMETHEUS_METRICS = (
+    ("calls", "counter", "Count of stage calls."),
+    ("wall_time", "counter", "Wall time of stage in seconds."),
+    ("cpu_time", "counter", "CPU time of stage thread in seconds."),
+    ("bytes", "counter", "Processed bytes."),
+    ("peak_memory", "gauge", "Max peak of allocations in stage in bytes."),
+)
+
+
+def to_prometheus(prefix: str = "ai_common_utils_stage") -> str:
+    """
+    Get statistics in Prometheus text exposition format.
+    """
+    stats = get_stats()
+    lines = []
+    for metric, metric_type, description in PROMETHEUS_METRICS:
+        name = "%s_%s" % (prefix, metric)
+        if metric_type == "counter":
+            name += "_total"
+        lines.append("# HELP %s %s" % (name, description))
+        lines.append("# TYPE %s %s" % (name, metric_type))
+        for path, values in sorted(stats.items()):
+            label = path.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append('%s{stage="%s"} %r' % (name, label, values[metric]))
+    return "\n".join(lines) + "\n"
+
+
+def save_prometheus(path: str, prefix: str = "ai_common_utils_stage"):
+    """
+    Save statistics in Prometheus text format (for node_exporter textfile collector).
+    """
+    _write(path, to_prometheus(prefix))
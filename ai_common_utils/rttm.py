@@ -11,7 +11,14 @@ p 12
 from typing import List, Union
 
 try:
-    from .files import open_list_rttm, open_json, save_list_rttm
+    from .files import (
+        open_list_rttm,
+        open_json,
+        save_list_rttm,
+        iter_jsonl,
+        append_jsonl,
+    )
+    from .json import loads
 except ImportError:
     pass
 
@@ -116,7 +123,7 @@ def combine_rttm_and_text_vosk(
     ----------
         `rttm` : path to rttm file or list rttm.
 
-        `text_vosk` : path to text vosk json file or List[dict] with vosk recognized text.
+        `text_vosk` : path to text vosk json (or JSON Lines `.jsonl`) file or List[dict] with vosk recognized text.
 
         `path_combined_rttm` (opt): path to save combined rttm.
 
@@ -130,7 +137,10 @@ def combine_rttm_and_text_vosk(
     temp_rttm = get_ts_and_names(rttm)
 
     if type(text_vosk) == str:
-        text_rec = open_json(text_vosk)
+        if text_vosk.endswith((".jsonl", ".jsonl.gz", ".jsonl.bz2", ".jsonl.xz")):
+            text_rec = iter_jsonl(text_vosk)
+        else:
+            text_rec = open_json(text_vosk)
     elif type(text_vosk) == list:
         text_rec = text_vosk
     else:
@@ -182,3 +192,18 @@ def jsr2rttm(jsr: dict):
         ]
         for row in jsr
     ]
+
+
+def append_vosk_result(path: str, result: Union[str, dict]):
+    """
+    Append vosk recognition result (`Result()` or `FinalResult()` of recognizer) to JSON Lines file.
+
+    Args
+    ----------
+        `path` : path to JSON Lines file.
+
+        `result` : vosk result (json str or dict).
+    """
+    if type(result) == str:
+        result = loads(result)
+    append_jsonl(path, [result])
@@ -0,0 +1,274 @@
+"""
+Solr bulk indexing utils (stdlib only).
+
+Documents (for example from `jsr.convert_for_solr` or `solr_parser.iter_dict_2_solr`) are sent
+to Solr update handler in batches through persistent keep-alive connections, concurrently
+with bounded count of requests in flight. Commit is done once, at the end.
+
+    with SolrIndexer("http://localhost:8983/solr/nlp") as indexer:
+        indexer.add_many(solr_parser.iter_dict_2_solr(results))
+"""
+
+import http.client
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
+from urllib.parse import urlsplit
+
+from .json import dumps
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class SolrIndexer:
+    """
+    Bulk indexer of documents into Solr collection.
+
+    Batch is sent, when it has `batch_size` documents or next document doesn't fit into `batch_bytes`. Each of `workers`
+    threads keeps own keep-alive connection. `add` blocks, when `max_in_flight` batches are sent or waiting.
+    Failed requests (connection errors, HTTP 429 and 5xx) are retried `retries` times with exponential
+    backoff. Errors are raised from `flush` or `close`. Used as context manager, indexer is closed at exit
+    or aborted (without commit), if exception is raised.
+
+    Args
+    ----------
+        `url` : url of Solr collection (core), for example "http://localhost:8983/solr/nlp".
+
+        `batch_size` (opt=1000): max count of documents in batch.
+
+        `batch_bytes` (opt=4MB): max size of batch in bytes.
+
+        `workers` (opt=4): count of sending threads (and connections).
+
+        `max_in_flight` (opt): max count of batches sent or waiting. Default - 2 * `workers`.
+
+        `retries` (opt=3): count of retries of failed request.
+
+        `backoff` (opt=0.5): delay in seconds before first retry, doubled for next ones.
+
+        `timeout` (opt=60): timeout of request in seconds.
+
+        `commit` (opt=True): commit at `close`.
+
+        `headers` (opt): additional headers of requests (for example "Authorization").
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_size: int = 1000,
+        batch_bytes: int = 4 * 1024**2,
+        workers: int = 4,
+        max_in_flight: int = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 60,
+        commit: bool = True,
+        headers: Dict[str, str] = None,
+    ) -> None:
+        url = urlsplit(url)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported url scheme: {url.scheme}!")
+        self._connection_cls = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._netloc = url.netloc
+        self._path_update = url.path.rstrip("/") + "/update"
+
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.commit = commit
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+        self.stats = {"docs": 0, "batches": 0, "bytes": 0, "retries": 0}
+
+        self._batch: List[bytes] = []
+        # size of request body: brackets and documents with commas
+        self._batch_len = 1
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="SolrIndexer")
+        self._in_flight = threading.BoundedSemaphore(max_in_flight or 2 * workers)
+        self._futures = set()
+        self._errors = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+        self._closed = False
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connection_cls(self._netloc, timeout=self.timeout)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _request(self, body: bytes, query: str = ""):
+        for attempt in range(self.retries + 1):
+            if attempt:
+                with self._lock:
+                    self.stats["retries"] += 1
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            connection = self._get_connection()
+            try:
+                connection.request(
+                    "POST", self._path_update + query, body, self.headers
+                )
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                # reconnect at next attempt
+                connection.close()
+                error = ConnectionError(f"Solr request failed: {e}")
+                continue
+
+            if response.status < 300:
+                return
+            error = RuntimeError(
+                f"Solr update failed: HTTP {response.status} "
+                f"{data[:500].decode('utf-8', 'replace')}"
+            )
+            if response.status not in RETRY_STATUSES:
+                break
+        raise error
+
+    def _send(self, body: bytes, n_docs: int):
+        self._request(body)
+        with self._lock:
+            self.stats["docs"] += n_docs
+            self.stats["batches"] += 1
+            self.stats["bytes"] += len(body)
+
+    def _done(self, future: Future):
+        with self._lock:
+            self._futures.discard(future)
+            if not future.cancelled() and future.exception() is not None:
+                self._errors.append(future.exception())
+        self._in_flight.release()
+
+    def _submit_batch(self):
+        if not self._batch:
+            return
+        body = b"[" + b",".join(self._batch) + b"]"
+        n_docs = len(self._batch)
+        self._batch = []
+        self._batch_len = 1
+
+        self._in_flight.acquire()
+        future = self._executor.submit(self._send, body, n_docs)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._done)
+
+    def add(self, doc: Dict[str, Any]):
+        """
+        Add document to current batch (batch is sent in background, when full).
+        """
+        if self._closed:
+            raise ValueError("SolrIndexer is closed!")
+        data = dumps(doc)
+        if self._batch and self._batch_len + len(data) + 1 > self.batch_bytes:
+            self._submit_batch()
+        self._batch.append(data)
+        self._batch_len += len(data) + 1
+        if len(self._batch) >= self.batch_size:
+            self._submit_batch()
+
+    def add_many(self, docs: Iterable[Dict[str, Any]]):
+        """
+        Add documents (any iterable, consumed lazily).
+        """
+        for doc in docs:
+            self.add(doc)
+
+    def _raise_errors(self):
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def flush(self):
+        """
+        Send current batch and wait until all batches are sent (without commit).
+        """
+        self._submit_batch()
+        while True:
+            with self._lock:
+                futures = list(self._futures)
+            if not futures:
+                break
+            for future in futures:
+                future.exception()
+        self._raise_errors()
+
+    def close(self):
+        """
+        Send all batches, commit (if `commit`) and close connections.
+        """
+        if self._closed:
+            return
+        try:
+            self.flush()
+            if self.commit:
+                self._executor.submit(self._request, b"{}", "?commit=true").result()
+        finally:
+            self._shutdown()
+
+    def abort(self):
+        """
+        Drop current batch and not sent batches, close connections without commit.
+        """
+        if self._closed:
+            return
+        self._batch = []
+        self._batch_len = 1
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+        self._shutdown()
+
+    def _shutdown(self):
+        self._closed = True
+        self._executor.shutdown()
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def index_solr(docs: Iterable[Dict[str, Any]], url: str, **kwargs) -> Dict[str, int]:
+    """
+    Index documents into Solr collection and commit (see `SolrIndexer`).
+
+    Args
+    ----------
+        `docs` : Solr documents.
+
+        `url` : url of Solr collection (core).
+
+        `**kwargs` : arguments of `SolrIndexer`.
+
+    Return
+    ----------
+        `Dict[str, int]` : stats - count of sent docs, batches, bytes and retries.
+    """
+    with SolrIndexer(url, **kwargs) as indexer:
+        indexer.add_many(docs)
+    return indexer.stats
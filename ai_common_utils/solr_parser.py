@@ -2,18 +2,129 @@
 Utils for changing dict-like data from outer modules into storage-friendly.
 """
 
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
 
-def parse_dict_2_solr(data: dict, additional_name: str = "NLP") -> list:
-    solr_like = []
-    try:
-        for key, doc in data.items():
-            inner_dict = {"id": key}
-            _, _ = rec_dict_2_solr(inner_dict, additional_name, doc)
-            solr_like.append(inner_dict)
-    except Exception as e:
-        print(f"Can't parse incoming dict: {e}")
-    finally:
-        return solr_like
+# Max count of cached names of fields and key-path prefixes (cache is cleared, when reached)
+MAX_CACHED_NAMES = 65536
+
+
+def parse_dict_2_solr(
+    data: Union[dict, Iterable[Tuple[str, dict]]],
+    additional_name: str = "NLP",
+    errors: List[Tuple[str, Exception]] = None,
+) -> list:
+    """
+    Flatten documents into Solr documents (see `iter_dict_2_solr`).
+
+    Args
+    ----------
+        `data` : dict with documents by id (or iterable of pairs id, document).
+
+        `additional_name` (opt="NLP"): suffix of names of fields.
+
+        `errors` (opt): list for pairs id, exception of documents that can't be parsed (default - log them).
+
+    Return
+    ----------
+        `list` : Solr documents.
+    """
+    return list(iter_dict_2_solr(data, additional_name, errors))
+
+
+def iter_dict_2_solr(
+    data: Union[dict, Iterable[Tuple[str, dict]]],
+    additional_name: str = "NLP",
+    errors: List[Tuple[str, Exception]] = None,
+) -> Iterator[dict]:
+    """
+    Lazily flatten documents into Solr documents.
+
+    Leaf value of nested key path `a -> b -> c` is saved into field "c_b_a_NLP" (newlines removed from str),
+    value of "raw_text" key on any level - into field "raw_text", id of document - into field "id".
+    Documents that can't be parsed are skipped.
+
+    Args
+    ----------
+        `data` : dict with documents by id (or iterable of pairs id, document).
+
+        `additional_name` (opt="NLP"): suffix of names of fields.
+
+        `errors` (opt): list for pairs id, exception of documents that can't be parsed (default - log them).
+
+    Return
+    ----------
+        `Iterator[dict]` : Solr documents.
+    """
+    if isinstance(data, dict):
+        data = data.items()
+
+    # names of fields by prefix and key, documents usually share the same keys
+    prefixes: Dict[str, Dict[Any, str]] = {}
+    n_names = 0
+
+    for key, doc in data:
+        if n_names > MAX_CACHED_NAMES:
+            prefixes.clear()
+            n_names = 0
+        try:
+            solr_doc, added = _flatten_doc(key, doc, additional_name, prefixes)
+            n_names += added
+        except Exception as e:
+            if errors is None:
+                logging.error(f"Can't parse incoming document {key}: {e}")
+            else:
+                errors.append((key, e))
+            continue
+        yield solr_doc
+
+
+def _flatten_doc(
+    doc_id: str, doc: Any, name: str, prefixes: Dict[str, Dict[Any, str]]
+) -> Tuple[dict, int]:
+    # returns Solr document and count of names added to cache
+    solr_doc = {"id": doc_id}
+    if not isinstance(doc, dict):
+        return solr_doc, 0
+
+    added = 0
+    names = prefixes.get(name)
+    if names is None:
+        names = prefixes[name] = {}
+        added += 1
+    stack = [(iter(doc.items()), name, names)]
+    push = stack.append
+
+    while stack:
+        items, name, names = stack[-1]
+        for key, value in items:
+            if key == "raw_text":
+                solr_doc["raw_text"] = value.replace("\n", "")
+                continue
+
+            try:
+                field = names[key]
+            except KeyError:
+                field = names[key] = key + "_" + name
+                added += 1
+
+            if type(value) is str:
+                solr_doc[field] = value.replace("\n", "")
+            elif isinstance(value, dict) and value:
+                child_names = prefixes.get(field)
+                if child_names is None:
+                    child_names = prefixes[field] = {}
+                    added += 1
+                push((iter(value.items()), field, child_names))
+                break
+            else:
+                solr_doc[field] = (
+                    value.replace("\n", "") if isinstance(value, str) else value
+                )
+        else:
+            stack.pop()
+
+    return solr_doc, added
 
 
 def rec_dict_2_solr(inner_dict, name, outer_value):
@@ -41,5 +152,65 @@ def rec_dict_2_solr(inner_dict, name, outer_value):
         return new_name, inner_value
 
 
-def parse_solr_2_dict():
-    pass
+def _template_paths(template: dict, name: str) -> Dict[str, Tuple[str, ...]]:
+    paths = {}
+    stack = [(template, name, ())]
+    while stack:
+        node, name, path = stack.pop()
+        for key, value in node.items():
+            if key == "raw_text":
+                paths["raw_text"] = path + (key,)
+                continue
+            field = key + "_" + name
+            if isinstance(value, dict) and value:
+                stack.append((value, field, path + (key,)))
+            else:
+                paths[field] = path + (key,)
+    return paths
+
+
+def parse_solr_2_dict(
+    docs: Iterable[dict], additional_name: str = "NLP", template: dict = None
+) -> dict:
+    """
+    Convert Solr documents back into dict with documents by id (inverse of `parse_dict_2_solr`).
+
+    Names of fields are split by "_", so keys with "_" are restored correctly only with `template` -
+    document (or dict with the same structure) to take key paths from. Fields without suffix
+    `additional_name` are saved as is, newlines removed by flattening aren't restored.
+
+    Args
+    ----------
+        `docs` : Solr documents.
+
+        `additional_name` (opt="NLP"): suffix of names of fields.
+
+        `template` (opt): document with the same structure as flattened ones.
+
+    Return
+    ----------
+        `dict` : documents by id.
+    """
+    paths = _template_paths(template, additional_name) if template else {}
+    suffix = "_" + additional_name
+
+    data = {}
+    for solr_doc in docs:
+        doc = {}
+        for field, value in solr_doc.items():
+            if field == "id":
+                continue
+
+            path = paths.get(field)
+            if path is None:
+                if field.endswith(suffix):
+                    path = tuple(reversed(field[: -len(suffix)].split("_")))
+                else:
+                    path = (field,)
+
+            node = doc
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = value
+        data[solr_doc["id"]] = doc
+    return data
@@ -2,13 +2,334 @@
 SRT (subtitles) utils.
 """
 
-import datetime
 import re
-from typing import List, Union
+import struct
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, repeat
+from typing import IO, Callable, Iterable, Iterator, List, Tuple, Union
 
-from .files import open_list_rttm, open_json
+from .files import BackgroundWriter, open_file, open_list_rttm, open_json, save_json
 from .rttm import get_ts_and_names
-from .date_and_time import format_time
+from .date_and_time import format_seconds, parse_seconds
+from .profiler import profile
+
+SUBTITLES_FORMATS = ("srt", "vtt")
+
+
+def format_cue(
+    counter: int, t_start: float, t_end: float, text: str, fmt: str = "srt"
+) -> str:
+    """
+    Format one subtitles cue.
+
+    Args
+    ----------
+        `counter` : number of cue (from 1).
+
+        `t_start` : time in seconds, when cue started.
+
+        `t_end` : time in seconds, when cue ended.
+
+        `text` : text of cue.
+
+        `fmt` (opt="srt"): format of subtitles - "srt" or "vtt".
+
+    Return
+    ----------
+        `str` : cue.
+    """
+    return f"{counter}\n{format_seconds(t_start, fmt)} --> {format_seconds(t_end, fmt)}\n{text}\n\n"
+
+
+def _get_replica_text(replica: dict) -> str:
+    name = (
+        ""
+        if "speaker" not in replica
+        else replica["speaker"]["display_name"]
+        if "display_name" in replica["speaker"]
+        else replica["speaker"]["idx"]
+    )
+    name = f"{name}: " if name else name
+    return f"{name}{replica['speech']['text']}"
+
+
+def _split_rttm_text(str_text: str, speaker_idx2name: dict = None):
+    str_text = str_text.split("/")
+
+    name = str_text[0]
+
+    if speaker_idx2name:
+        if name in speaker_idx2name:
+            name = speaker_idx2name[name]
+
+    name = re.sub("_", " ", name)
+
+    str_text = str_text[1:]
+    str_text.append(",")
+    return name, list(enumerate(str_text))
+
+
+def _join_punct_predictions(punct, name: str, predictions) -> str:
+    results = []
+
+    for token, case_label, punc_label in predictions:
+        prediction = punct.map_punc_label(
+            punct.map_case_label(token[1], case_label), punc_label
+        )
+        if token[1][0] != "#":
+            results.append(" ")
+        results.append(prediction)
+
+    return f"{name}: {''.join(results)[:-1]}"
+
+
+def _punct_predict(punct, tokens):
+    return list(punct.predict(tokens, lambda x: x[1]))
+
+
+def _punct_predict_batch(punct, tokens_batch) -> List[list]:
+    """
+    Predict punctuation of lines, each line is separate sequence
+    (one `punct.predict_batch` call, if model supports batches, else line by line).
+    """
+    predict_batch = getattr(punct, "predict_batch", None)
+    if predict_batch is None:
+        return [_punct_predict(punct, tokens) for tokens in tokens_batch]
+    return [
+        list(predictions)
+        for predictions in predict_batch(list(tokens_batch), lambda x: x[1])
+    ]
+
+
+def _iter_rttm_texts(
+    rttm: Iterable[List[str]],
+    punct=None,
+    speaker_idx2name: dict = None,
+    punct_batch_size: int = None,
+    punct_batch_func: Callable = None,
+    punct_workers: int = None,
+) -> Iterator[Tuple[float, float, str]]:
+    lines = (get_ts_and_names([line], do_enumerate=False)[0] for line in rttm)
+
+    if not punct:
+        yield from lines
+        return
+
+    if not punct_batch_size and not punct_batch_func and not punct_workers:
+        for t_start, t_end, str_text in lines:
+            name, tokens = _split_rttm_text(str_text, speaker_idx2name)
+            yield t_start, t_end, _join_punct_predictions(
+                punct, name, _punct_predict(punct, tokens)
+            )
+        return
+
+    executor = ThreadPoolExecutor(punct_workers) if punct_workers else None
+    try:
+        while True:
+            batch = list(islice(lines, punct_batch_size or 64))
+            if not batch:
+                return
+
+            names, tokens_batch = zip(
+                *[
+                    _split_rttm_text(str_text, speaker_idx2name)
+                    for _, _, str_text in batch
+                ]
+            )
+
+            if punct_batch_func:
+                predictions = punct_batch_func(list(tokens_batch))
+            elif executor:
+                predictions = executor.map(_punct_predict, repeat(punct), tokens_batch)
+            else:
+                predictions = _punct_predict_batch(punct, tokens_batch)
+
+            for (t_start, t_end, _), name, prediction in zip(batch, names, predictions):
+                yield t_start, t_end, _join_punct_predictions(punct, name, prediction)
+    finally:
+        if executor:
+            executor.shutdown()
+
+
+def iter_jsr_cues(jsr: Iterable[dict], fmt: str = "srt") -> Iterator[str]:
+    """
+    Iterate over subtitles cues of JSR replicas (header of "vtt" format included).
+
+    Args
+    ----------
+        `jsr` : JSR or any iterator of replicas.
+
+        `fmt` (opt="srt"): format of subtitles - "srt" or "vtt".
+
+    Return
+    ----------
+        `Iterator[str]` : subtitles cues.
+    """
+    if fmt not in SUBTITLES_FORMATS:
+        raise ValueError(f"fmt should be one of {SUBTITLES_FORMATS}!")
+
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+
+    for counter, replica in enumerate(jsr, 1):
+        yield format_cue(
+            counter,
+            replica["speech"]["time_start"],
+            replica["speech"]["time_end"],
+            _get_replica_text(replica),
+            fmt,
+        )
+
+
+def iter_rttm_cues(
+    rttm: Iterable[List[str]],
+    punct=None,
+    speaker_idx2name: dict = None,
+    fmt: str = "srt",
+    punct_batch_size: int = None,
+    punct_batch_func: Callable = None,
+    punct_workers: int = None,
+) -> Iterator[str]:
+    """
+    Iterate over subtitles cues of rttm lines (header of "vtt" format included).
+
+    Args
+    ----------
+        `rttm` : list rttm or any iterator of rttm lines.
+
+        `punct` (opt): punctuation model CasePuncPredictor.
+
+        `speaker_idx2name` (opt): dict of speakaer_idx:speaker_name format. If provided change idx to name for each speaker
+
+        `fmt` (opt="srt"): format of subtitles - "srt" or "vtt".
+
+        `punct_batch_size` (opt): count of rttm lines predicted by `punct` as batch of sequences (one sequence
+        per line) with `punct.predict_batch(list of tokens of lines, key)`, if model has it, else line by line.
+        Default 64, if `punct_batch_func` or `punct_workers` provided, else each line predicted separately.
+
+        `punct_batch_func` (opt): function for batch prediction, that takes list of tokens of each line
+        (`[(i, word), ...]` as for `punct.predict`) and returns list of `punct.predict` results for each line.
+
+        `punct_workers` (opt): count of threads for `punct.predict` (for models that release the GIL).
+
+    Return
+    ----------
+        `Iterator[str]` : subtitles cues.
+    """
+    if fmt not in SUBTITLES_FORMATS:
+        raise ValueError(f"fmt should be one of {SUBTITLES_FORMATS}!")
+
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+
+    texts = _iter_rttm_texts(
+        rttm,
+        punct,
+        speaker_idx2name,
+        punct_batch_size,
+        punct_batch_func,
+        punct_workers,
+    )
+    for counter, (t_start, t_end, text) in enumerate(texts, 1):
+        yield format_cue(counter, t_start, t_end, text, fmt)
+
+
+class SubtitlesWriter:
+    """
+    Stream subtitles cues to file with constant memory.
+
+    Args
+    ----------
+        `file` : path to subtitles file or opened text file object.
+
+        `fmt` (opt="srt"): format of subtitles - "srt" or "vtt".
+    """
+
+    def __init__(self, file: Union[str, IO[str]], fmt: str = "srt") -> None:
+        if fmt not in SUBTITLES_FORMATS:
+            raise ValueError(f"fmt should be one of {SUBTITLES_FORMATS}!")
+
+        self.fmt = fmt
+        self.counter = 0
+        self._own_file = type(file) == str
+        self.file = open(file, "w", encoding="utf8") if self._own_file else file
+
+        if fmt == "vtt":
+            self.file.write("WEBVTT\n\n")
+
+    def write(self, t_start: float, t_end: float, text: str):
+        """
+        Write one cue.
+
+        Args
+        ----------
+            `t_start` : time in seconds, when cue started.
+
+            `t_end` : time in seconds, when cue ended.
+
+            `text` : text of cue.
+        """
+        self.counter += 1
+        self.file.write(format_cue(self.counter, t_start, t_end, text, self.fmt))
+
+    def write_jsr(self, jsr: Iterable[dict]):
+        """
+        Write cues of JSR replicas.
+
+        Args
+        ----------
+            `jsr` : JSR or any iterator of replicas.
+        """
+        for replica in jsr:
+            self.write(
+                replica["speech"]["time_start"],
+                replica["speech"]["time_end"],
+                _get_replica_text(replica),
+            )
+
+    def write_rttm(
+        self,
+        rttm: Iterable[List[str]],
+        punct=None,
+        speaker_idx2name: dict = None,
+        punct_batch_size: int = None,
+        punct_batch_func: Callable = None,
+        punct_workers: int = None,
+    ):
+        """
+        Write cues of rttm lines.
+
+        Args
+        ----------
+            `rttm` : list rttm or any iterator of rttm lines.
+
+            `punct` (opt): punctuation model CasePuncPredictor.
+
+            `speaker_idx2name` (opt): dict of speakaer_idx:speaker_name format.
+
+            `punct_batch_size`, `punct_batch_func`, `punct_workers` (opt): see `iter_rttm_cues`.
+        """
+        for t_start, t_end, text in _iter_rttm_texts(
+            rttm,
+            punct,
+            speaker_idx2name,
+            punct_batch_size,
+            punct_batch_func,
+            punct_workers,
+        ):
+            self.write(t_start, t_end, text)
+
+    def close(self):
+        if self._own_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
 
 def rttm2srt(
@@ -16,6 +337,11 @@ def rttm2srt(
     path_srt: str = None,
     punct=None,
     speaker_idx2name: dict = None,
+    fmt: str = "srt",
+    punct_batch_size: int = None,
+    punct_batch_func: Callable = None,
+    punct_workers: int = None,
+    writer: BackgroundWriter = None,
 ):
     """
     Convert rttm to SRT (subtitles).
@@ -29,6 +355,16 @@ def rttm2srt(
 
         `speaker_idx2name` (opt): dict of speakaer_idx:speaker_name format. If provided change idx to name for each speaker
 
+        `fmt` (opt="srt"): format of subtitles - "srt" or "vtt".
+
+        `punct_batch_size` (opt): count of rttm lines predicted by `punct` as batch (see `iter_rttm_cues`).
+
+        `punct_batch_func` (opt): function for batch prediction (see `iter_rttm_cues`).
+
+        `punct_workers` (opt): count of threads for `punct.predict` (for models that release the GIL).
+
+        `writer` (opt): write file in background (see `files.BackgroundWriter`), errors are raised from `writer.flush`.
+
     Return
     ----------
         `str` : SRT (subtitles)
@@ -36,87 +372,288 @@ def rttm2srt(
     if type(rttm) == str:
         rttm = open_list_rttm(rttm)
 
-    rttm = get_ts_and_names(rttm, do_enumerate=False)
+    srt = "".join(
+        iter_rttm_cues(
+            rttm,
+            punct,
+            speaker_idx2name,
+            fmt,
+            punct_batch_size,
+            punct_batch_func,
+            punct_workers,
+        )
+    )
 
-    srt = ""
-    counter = 0
+    if path_srt:
+        if writer:
+            writer.submit(path_srt, srt)
+        else:
+            with open(path_srt, "w") as f:
+                f.write(srt)
 
-    for t_start, t_end, str_text in rttm:
-        counter += 1
-        srt += f"{counter}\n"
-        srt += f"{format_time(datetime.timedelta(seconds=t_start))} --> {format_time(datetime.timedelta(seconds=t_end))}\n"
+    return srt
 
-        if not punct:
-            srt += f"{str_text}\n\n"
-        else:
-            str_text = str_text.split("/")
 
-            name = str_text[0]
+@profile()
+def jsr2srt(
+    jsr: Union[str, List[dict]],
+    path_save: str = None,
+    fmt: str = "srt",
+    writer: BackgroundWriter = None,
+):
+    """
+    Convert JSR to SRT (subtitles).
+    Args
+    ----------
+        `rttm` : path to JSR file or jsr variable.
 
-            if speaker_idx2name:
-                if name in speaker_idx2name:
-                    name = speaker_idx2name[name]
+        `path_save` (opt): path to SRT file to save.
 
-            name = re.sub("_", " ", name)
+        `fmt` (opt="srt"): format of subtitles - "srt" or "vtt".
 
-            str_text = str_text[1:]
-            str_text.append(",")
-            tokens = list(enumerate(str_text))
-            results = ""
+        `writer` (opt): write file in background (see `files.BackgroundWriter`), errors are raised from `writer.flush`.
 
-            for token, case_label, punc_label in punct.predict(tokens, lambda x: x[1]):
-                prediction = punct.map_punc_label(
-                    punct.map_case_label(token[1], case_label), punc_label
-                )
-                if token[1][0] != "#":
-                    results = results + " " + prediction
-                else:
-                    results = results + prediction
+    Return
+    ----------
+        `str` : SRT (subtitles)
+    """
+    if type(jsr) == str:
+        jsr = open_json(jsr)
 
-            srt += f"{name}: {results[:-1]}\n\n"
+    srt = "".join(iter_jsr_cues(jsr, fmt))
 
-    if path_srt:
-        with open(path_srt, "w") as f:
-            f.write(srt)
+    if path_save:
+        if writer:
+            writer.submit(path_save, srt)
+        else:
+            with open(path_save, "w") as f:
+                f.write(srt)
 
     return srt
 
 
-def jsr2srt(jsr: Union[str, List[dict]], path_save: str = None):
+SPEAKER_PREFIX = re.compile(r"^([^:<>]{1,64}): (.*)$", re.S)
+VOICE_TAG = re.compile(r"^<v(?:\.[^ >]*)? ([^>]+)>(.*?)(?:</v>)?$", re.S)
+
+
+def _parse_cue(lines: List[str], speakers: bool = True) -> Union[dict, None]:
     """
-    Convert JSR to SRT (subtitles).
+    Parse lines of one subtitles block to replica (None if block is not cue).
+    """
+    for i, line in enumerate(lines):
+        if "-->" in line:
+            break
+    else:
+        return None
+
+    t_start, t_end = line.split("-->", 1)
+    t_start = parse_seconds(t_start)
+    t_end = parse_seconds(t_end.split()[0])
+    text = " ".join(line.strip() for line in lines[i + 1 :])
+
+    replica = {}
+    if speakers:
+        match = VOICE_TAG.match(text) or SPEAKER_PREFIX.match(text)
+        if match:
+            replica["speaker"] = {"idx": match.group(1).strip()}
+            text = match.group(2)
+
+    replica["speech"] = {
+        "time_start": t_start,
+        "time_end": t_end,
+        "duration": t_end - t_start,
+        "text": text,
+    }
+    return replica
+
+
+def iter_subtitles(
+    subtitles: Union[str, IO[str], Iterable[str]], speakers: bool = True
+) -> Iterator[dict]:
+    """
+    Parse SRT or WebVTT subtitles to JSR replicas with constant memory.
+
     Args
     ----------
-        `rttm` : path to JSR file or jsr variable.
+        `subtitles` : path to subtitles file (may be compressed, see `files.open_file`),
+        opened text file object or iterator of lines.
 
-        `path_save` (opt): path to SRT file to save.
+        `speakers` (opt=True): map "Name: text" prefix (as written by `jsr2srt`)
+        or WebVTT voice tag "<v Name>text" to speaker of replica.
 
     Return
     ----------
-        `str` : SRT (subtitles)
+        `Iterator[dict]` : JSR replicas.
     """
-    if type(jsr) == str:
-        jsr = open_json(jsr)
+    if type(subtitles) == str:
+        with open_file(subtitles, "rt", encoding="utf-8-sig") as f:
+            yield from iter_subtitles(f, speakers)
+        return
 
-    srt = ""
-    counter = 0
-
-    for replica in jsr:
-        counter += 1
-        name = (
-            ""
-            if "speaker" not in replica
-            else replica["speaker"]["display_name"]
-            if "display_name" in replica["speaker"]
-            else replica["speaker"]["idx"]
-        )
-        name = f"{name}: " if name else name
-        srt += f"{counter}\n"
-        srt += f"{format_time(datetime.timedelta(seconds=replica['speech']['time_start']))} --> {format_time(datetime.timedelta(seconds=replica['speech']['time_end']))}\n"
-        srt += f"{name}{replica['speech']['text']}\n\n"
+    block = []
+    for line in subtitles:
+        line = line.rstrip("\r\n").lstrip("\ufeff")
+        if line.strip():
+            block.append(line)
+        elif block:
+            replica = _parse_cue(block, speakers)
+            if replica:
+                yield replica
+            block = []
+
+    if block:
+        replica = _parse_cue(block, speakers)
+        if replica:
+            yield replica
+
+
+def srt2jsr(
+    subtitles: Union[str, IO[str]], path_save: str = None, speakers: bool = True
+) -> List[dict]:
+    """
+    Convert SRT or WebVTT (subtitles) to JSR.
+
+    Args
+    ----------
+        `subtitles` : path to subtitles file or opened text file object.
+
+        `path_save` (opt): path to JSR file to save.
+
+        `speakers` (opt=True): map "Name: text" prefix to speaker of replica.
+
+    Return
+    ----------
+        `JSR` : JSR file format.
+    """
+    jsr = list(iter_subtitles(subtitles, speakers))
 
     if path_save:
-        with open(path_save, "w") as f:
-            f.write(srt)
+        save_json(path_save, jsr)
 
-    return srt
+    return jsr
+
+
+class SubtitlesIndex:
+    """
+    Compact index of cues offsets in SRT or WebVTT file for reading only cues at needed time.
+
+    Index is built with one streaming pass over file (or loaded with `load`)
+    and keeps 5 numbers per cue.
+
+    Args
+    ----------
+        `path` : path to subtitles file.
+
+        `speakers` (opt=True): map "Name: text" prefix to speaker of replica.
+    """
+
+    def __init__(self, path: str, speakers: bool = True) -> None:
+        self.path = path
+        self.speakers = speakers
+        self.starts = array("d")
+        self.ends = array("d")
+        self.offsets = array("q")
+        self.lengths = array("q")
+
+        cues = []
+        with open(path, "rb") as f:
+            offset = 0
+            block_offset = 0
+            times = None
+            for line in f:
+                if line.strip():
+                    if times is None and b"-->" in line:
+                        t_start, t_end = line.decode("utf-8").split("-->", 1)
+                        times = (
+                            parse_seconds(t_start),
+                            parse_seconds(t_end.split()[0]),
+                        )
+                else:
+                    if times:
+                        cues.append((*times, block_offset, offset - block_offset))
+                    times = None
+                    block_offset = offset + len(line)
+                offset += len(line)
+            if times:
+                cues.append((*times, block_offset, offset - block_offset))
+
+        self._set_cues(cues)
+
+    def _set_cues(self, cues: List[Tuple[float, float, int, int]]):
+        cues.sort(key=lambda cue: cue[0])
+        self.starts = array("d", [cue[0] for cue in cues])
+        self.ends = array("d", [cue[1] for cue in cues])
+        self.offsets = array("q", [cue[2] for cue in cues])
+        self.lengths = array("q", [cue[3] for cue in cues])
+
+        # Running max of ends for searching overlapping cues
+        self.max_ends = array("d", self.ends)
+        for i in range(1, len(self.max_ends)):
+            if self.max_ends[i] < self.max_ends[i - 1]:
+                self.max_ends[i] = self.max_ends[i - 1]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def save(self, path_index: str):
+        """
+        Save index to binary file.
+        """
+        with open(path_index, "wb") as f:
+            f.write(struct.pack("<q", len(self)))
+            for values in (self.starts, self.ends, self.offsets, self.lengths):
+                f.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path: str, path_index: str, speakers: bool = True):
+        """
+        Load index saved with `save`.
+
+        Args
+        ----------
+            `path` : path to subtitles file.
+
+            `path_index` : path to index file.
+
+            `speakers` (opt=True): map "Name: text" prefix to speaker of replica.
+        """
+        index = cls.__new__(cls)
+        index.path = path
+        index.speakers = speakers
+        with open(path_index, "rb") as f:
+            (n,) = struct.unpack("<q", f.read(8))
+            values = []
+            for typecode in "ddqq":
+                values.append(array(typecode))
+                values[-1].frombytes(f.read(n * 8))
+        index._set_cues(list(zip(*values)))
+        return index
+
+    def _read_cues(self, idx: List[int]) -> List[dict]:
+        replicas = []
+        if not idx:
+            return replicas
+        with open(self.path, "rb") as f:
+            for i in idx:
+                f.seek(self.offsets[i])
+                lines = f.read(self.lengths[i]).decode("utf-8").splitlines()
+                replica = _parse_cue(
+                    [line for line in lines if line.strip()], self.speakers
+                )
+                if replica:
+                    replicas.append(replica)
+        return replicas
+
+    def cues_at(self, t: float) -> List[dict]:
+        """
+        Get cues (JSR replicas) shown at time `t` in seconds.
+        """
+        return self.cues_between(t, t)
+
+    def cues_between(self, time_start: float, time_end: float) -> List[dict]:
+        """
+        Get cues (JSR replicas) intersecting with time interval in seconds.
+        """
+        lo = bisect_right(self.max_ends, time_start)
+        hi = bisect_right(self.starts, time_end)
+        return self._read_cues([i for i in range(lo, hi) if self.ends[i] > time_start])
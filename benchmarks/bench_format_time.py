@@ -0,0 +1,41 @@
+"""
+Benchmark of timestamps formatting for subtitles cues.
+
+python benchmarks/bench_format_time.py
+"""
+
+from os import path
+import datetime
+import random
+import sys
+import timeit
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils.date_and_time import (
+    format_seconds,
+    format_seconds_batch,
+    format_time,
+)
+
+
+def main(n: int = 100000, number: int = 5):
+    times = [random.uniform(0, 36000) for _ in range(n)]
+
+    results = {
+        "format_time(timedelta)": lambda: [
+            format_time(datetime.timedelta(seconds=t)) for t in times
+        ],
+        "format_seconds": lambda: [format_seconds(t) for t in times],
+        "format_seconds_batch": lambda: format_seconds_batch(times),
+    }
+
+    base = None
+    for name, func in results.items():
+        t = timeit.timeit(func, number=number) / number
+        base = base or t
+        print(f"{name:<24} {t * 1e9 / n:8.1f} ns/time  x{base / t:.1f}")
+
+
+if __name__ == "__main__":
+    main()
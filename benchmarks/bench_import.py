@@ -0,0 +1,46 @@
+"""
+Benchmark of import time of package and its submodules (in new interpreter).
+
+python benchmarks/bench_import.py
+"""
+
+from os import path
+import subprocess
+import sys
+import time
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+
+STATEMENTS = (
+    "pass",
+    "import ai_common_utils",
+    "from ai_common_utils import date_and_time",
+    "from ai_common_utils import rttm",
+    "from ai_common_utils import jsr",
+    "from ai_common_utils import audio",
+    # same as eager import of all submodules
+    "import ai_common_utils; [getattr(ai_common_utils, m) for m in ai_common_utils.__all__]",
+)
+
+
+def bench(statement: str, repeat: int = 10) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", statement],
+            cwd=ROOT,
+            check=True,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def main():
+    for statement in STATEMENTS:
+        print(f"{bench(statement) * 1000:7.1f} ms  {statement}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark of JSR saving and loading with available JSON backends.
+
+python benchmarks/bench_json.py
+"""
+
+from os import path
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils import json as json_utils
+from ai_common_utils.files import open_json, save_json
+
+
+def make_jsr(n_replicas: int = 20000, n_tokens: int = 20):
+    jsr = []
+    t = 0.0
+    for i in range(n_replicas):
+        tokens = []
+        for j in range(n_tokens):
+            tokens.append(
+                {
+                    "start": t,
+                    "end": t + 0.3,
+                    "word": f"слово{j}",
+                    "conf": random.random(),
+                }
+            )
+            t += 0.35
+        jsr.append(
+            {
+                "id": str(i),
+                "speaker": {"idx": f"speaker_{i % 3}", "conf": random.random()},
+                "speech": {
+                    "time_start": tokens[0]["start"],
+                    "time_end": tokens[-1]["end"],
+                    "duration": tokens[-1]["end"] - tokens[0]["start"],
+                    "tokens": tokens,
+                    "text": " ".join(token["word"] for token in tokens),
+                    "conf": random.random(),
+                },
+            }
+        )
+    return jsr
+
+
+def main():
+    jsr = make_jsr()
+    backends = ["json"]
+    if json_utils.orjson:
+        backends.append("orjson")
+    if json_utils.ujson:
+        backends.append("ujson")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path_jsr = os.path.join(tmp, "bench.jsr.json")
+        for backend in backends:
+            json_utils.set_json_backend(backend)
+            for pretty in (True, False):
+                t = time.perf_counter()
+                save_json(path_jsr, jsr, pretty=pretty)
+                t_save = time.perf_counter() - t
+
+                t = time.perf_counter()
+                open_json(path_jsr)
+                t_open = time.perf_counter() - t
+
+                size = os.path.getsize(path_jsr) / 1024**2
+                print(
+                    f"{backend:<7} {'pretty' if pretty else 'compact':<8}"
+                    f" save {t_save:6.3f}s  open {t_open:6.3f}s  size {size:6.1f}MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
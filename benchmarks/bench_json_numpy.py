@@ -0,0 +1,65 @@
+"""
+Benchmark of JSON serialization of results with numpy embeddings and scores.
+
+python benchmarks/bench_json_numpy.py
+"""
+
+from os import path
+import json
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils import json as json_utils
+
+
+class LegacyNumpyEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, float):
+            return str(obj)
+        return json.JSONEncoder.default(self, obj)
+
+
+def make_results(n_replicas: int = 2000, n_tokens: int = 20, dim: int = 192):
+    return [
+        {
+            "id": str(i),
+            "embedding": np.random.rand(dim).astype(np.float32),
+            "tokens": [
+                {"word": f"w{j}", "conf": np.float32(np.random.rand())}
+                for j in range(n_tokens)
+            ],
+        }
+        for i in range(n_replicas)
+    ]
+
+
+def bench(name, func):
+    t = time.perf_counter()
+    data = func()
+    print(f"{name:<28} {time.perf_counter() - t:6.3f}s  {len(data) / 1024**2:6.1f}MB")
+
+
+def main():
+    results = make_results()
+    # legacy encoder can't serialize numpy scalars at all
+    legacy = [dict(r, tokens=[]) for r in results]
+    bench("legacy (arrays only)", lambda: json.dumps(legacy, cls=LegacyNumpyEncoder))
+
+    backends = ["json"] + (["orjson"] if json_utils.orjson else [])
+    for backend in backends:
+        json_utils.set_json_backend(backend)
+        bench(f"{backend} dumps_numpy", lambda: json_utils.dumps_numpy(results))
+        bench(
+            f"{backend} dumps_numpy binary",
+            lambda: json_utils.dumps_numpy(results, binary_threshold=64),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark of Solr bulk indexing into local mock Solr server.
+
+python benchmarks/bench_solr_indexer.py
+"""
+
+from os import path
+import sys
+import time
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils.solr_indexer import index_solr
+from tests.mock_solr import MockSolr
+
+
+def main(n_docs: int = 100000):
+    docs = [
+        {"id": str(i), "text": f"some text {i}", "speaker_id": "speaker_0"}
+        for i in range(n_docs)
+    ]
+    for batch_size, workers in ((1, 1), (1000, 1), (1000, 4)):
+        n = n_docs if batch_size > 1 else n_docs // 100
+        server = MockSolr()
+        t = time.perf_counter()
+        index_solr(docs[:n], server.url, batch_size=batch_size, workers=workers)
+        t = time.perf_counter() - t
+        server.shutdown()
+        print(
+            f"batch_size {batch_size:<5} workers {workers}"
+            f"  {n / t:9.0f} docs/s  connections {server.connections}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark of flattening of NLP results into Solr documents.
+
+python benchmarks/bench_solr_parser.py
+"""
+
+from os import path
+import sys
+import time
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils.solr_parser import iter_dict_2_solr, rec_dict_2_solr
+
+
+def make_data(n_docs: int = 200000):
+    return {
+        f"doc{i}": {
+            "raw_text": "some\ntext",
+            "lang": "en",
+            "ner": {"person": "Anna", "org": {"name": "ACME", "score": 0.5}},
+            "sentiment": {"label": "positive", "score": 0.9},
+        }
+        for i in range(n_docs)
+    }
+
+
+def legacy(data):
+    for key, doc in data.items():
+        inner_dict = {"id": key}
+        rec_dict_2_solr(inner_dict, "NLP", doc)
+        yield inner_dict
+
+
+def bench(name, func, data):
+    t = time.perf_counter()
+    for _ in func(data):
+        pass
+    print(f"{name:<16} {time.perf_counter() - t:6.3f}s")
+
+
+def main():
+    data = make_data()
+    bench("recursive", legacy, data)
+    bench("iterative", iter_dict_2_solr, data)
+
+
+if __name__ == "__main__":
+    main()
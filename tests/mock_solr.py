@@ -0,0 +1,61 @@
+"""
+Local mock of Solr update handler for tests and benchmarks of `solr_indexer`.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockSolr(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fail_first: int = 0, status: int = 503):
+        super().__init__(("127.0.0.1", 0), MockSolrHandler)
+        self.fail_first = fail_first
+        self.status = status
+        self.batches = []
+        self.commits = 0
+        self.max_body = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:%d/solr/nlp" % self.server_address[1]
+
+
+class MockSolrHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        assert self.path.startswith("/solr/nlp/update")
+
+        with self.server.lock:
+            status = 200
+            if self.server.fail_first > 0:
+                self.server.fail_first -= 1
+                status = self.server.status
+            elif "commit=true" in self.path:
+                self.server.commits += 1
+            else:
+                self.server.batches.append(json.loads(body))
+                self.server.max_body = max(self.server.max_body, len(body))
+
+        data = b'{"responseHeader":{"status":0}}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
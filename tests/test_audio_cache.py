@@ -0,0 +1,85 @@
+from os import path
+import io
+import os
+import sys
+import time
+import wave
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils.audio import AudioCache, get_audio, get_time_audio
+
+
+def make_wav(seconds: int) -> bytes:
+    temp_f = io.BytesIO()
+    with wave.open(temp_f, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(b"\x00\x00" * 16000 * seconds)
+    return temp_f.getvalue()
+
+
+def test_audio_cache_hit(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    data = make_wav(1)
+
+    key = cache.key(data, 1.0, 2.0)
+    assert key == cache.key(io.BytesIO(data), 1.0, 2.0)
+    assert key != cache.key(data, 1.0, 3.0)
+    assert cache.get(key) is None
+
+    cache.put(key, data)
+    # cached audio returned without decoding
+    audio = get_audio(data, 1.0, 2.0, cache=cache)
+    assert audio[:] == data
+    assert get_time_audio(audio) == "0:00:01"
+
+
+def test_audio_cache_reuse(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    data = make_wav(1)
+    cache.put(cache.key(data), data)
+
+    audio = get_audio(data, cache=cache)
+    assert get_time_audio(audio) == "0:00:01"
+    assert get_time_audio(audio) == "0:00:01"
+
+    # cached audio can be passed back as source
+    cache.put(cache.key(audio), data)
+    again = get_audio(audio, cache=cache)
+    assert get_time_audio(again) == get_time_audio(audio) == "0:00:01"
+
+
+def test_audio_cache_path_key(tmp_path):
+    cache = AudioCache(str(tmp_path / "cache"))
+    path_audio = str(tmp_path / "audio.wav")
+    with open(path_audio, "wb") as f:
+        f.write(make_wav(1))
+
+    key = cache.key(path_audio)
+    os.utime(path_audio, ns=(0, 0))
+    assert key != cache.key(path_audio)
+    assert AudioCache(str(tmp_path / "cache"), hash_files=True).key(
+        path_audio
+    ) == AudioCache(str(tmp_path / "cache"), hash_files=True).key(path_audio)
+
+
+def test_audio_cache_lru_eviction(tmp_path):
+    data = make_wav(1)
+    cache = AudioCache(str(tmp_path), max_size=len(data) * 2)
+
+    cache.put("a", data)
+    time.sleep(0.01)
+    cache.put("b", data)
+    time.sleep(0.01)
+    assert cache.get("a") is not None  # "a" now most recently used
+    time.sleep(0.01)
+    cache.put("c", data)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+    cache.clear()
+    assert cache.get("a") is None
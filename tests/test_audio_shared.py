@@ -0,0 +1,55 @@
+from os import path
+import sys
+from multiprocessing import Pool
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from ai_common_utils.audio import SharedAudio, audio2numpy
+from tests.test_audio_cache import make_wav
+
+
+def worker_sum(handle):
+    with handle.attach() as sound:
+        return int(sound.astype("int64").sum())
+
+
+def test_audio2numpy_zero_copy():
+    data = make_wav(1)
+    sound = audio2numpy(data)
+    assert sound.dtype == np.int16
+    assert sound.size == 16000
+    assert not sound.flags.owndata
+
+
+def test_shared_audio_workers():
+    sound = np.arange(16000 * 3, dtype=np.int16)
+
+    with SharedAudio(sound) as shared:
+        handles = [shared.handle(i, i + 1) for i in range(3)]
+        assert handles[1].offset == 16000 and handles[1].n_samples == 16000
+        assert handles[1].cut(0.5).offset == 24000
+
+        with Pool(2) as pool:
+            sums = pool.map(worker_sum, handles)
+
+        for handle in handles:
+            shared.release(handle)
+
+    assert sums == [int(sound[i * 16000 : (i + 1) * 16000].sum()) for i in range(3)]
+
+
+def test_shared_audio_refcount():
+    shared = SharedAudio(np.zeros(100, dtype=np.int16))
+    handle = shared.handle()
+    shared.close()
+
+    with handle.attach() as sound:
+        assert sound.size == 100
+
+    shared.release(handle)
+    with pytest.raises(FileNotFoundError):
+        handle.attach()
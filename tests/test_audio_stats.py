@@ -0,0 +1,57 @@
+from os import path
+import sys
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from ai_common_utils.audio import get_replicas_stats
+
+
+def replica(idx, t_start, t_end):
+    return {
+        "speaker": {"idx": idx, "conf": 1},
+        "speech": {"time_start": t_start, "time_end": t_end},
+    }
+
+
+def test_replicas_stats():
+    rng = np.random.default_rng(0)
+    sound = rng.integers(-100, 100, 10000, dtype=np.int16)
+    sound[1000:3000] = rng.integers(-20000, 20000, 2000)
+    sound[2000] = 32767
+    jsr = [replica("a", 0.1, 0.3), replica("b", 0.2, 0.5), replica("a", 0.6, 0.6)]
+
+    stats = get_replicas_stats(sound, jsr, rate=10000)
+
+    def expected(part):
+        power = (part.astype(np.float64) ** 2).mean()
+        return 10 * np.log10(power / 32768.0**2), power
+
+    noise = (
+        np.concatenate([sound[:1000], sound[5000:]]).astype(np.float64) ** 2
+    ).mean()
+    for (_, t_start, t_end), result in zip(
+        [(0, 1000, 3000), (1, 2000, 5000)], stats["replicas"]
+    ):
+        rms_db, power = expected(sound[t_start:t_end])
+        assert result["rms_db"] == pytest.approx(rms_db)
+        assert result["snr_db"] == pytest.approx(10 * np.log10(power / noise))
+        assert result["peak_db"] == pytest.approx(
+            20 * np.log10(np.abs(sound[t_start:t_end].astype(int)).max() / 32768)
+        )
+        assert result["clipping"] == pytest.approx(1 / (t_end - t_start))
+
+    assert stats["replicas"][2]["clipping"] == 0
+    assert list(stats["speakers"]) == ["a", "b"]
+    assert stats["speakers"]["a"]["duration"] == pytest.approx(0.2)
+
+
+def test_replicas_stats_rttm():
+    sound = np.full(100, 1000, dtype=np.int16)
+    rttm = [["SPEAKER", "f", "1", "0.1", "0.2", "<NA>", "<NA>", "s1/hi", "1", "<NA>"]]
+    stats = get_replicas_stats(sound, rttm, rate=100)
+    assert stats["replicas"][0]["snr_db"] == pytest.approx(0)
+    assert list(stats["speakers"]) == ["s1"]
@@ -0,0 +1,32 @@
+from os import path
+import sys
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from ai_common_utils.audio import energy_vad
+
+
+def test_energy_vad():
+    rate = 16000
+    sound = np.zeros(rate * 10, dtype=np.int16)
+    sound[rate * 2 : rate * 4] = 10000
+    sound[rate * 4 + rate // 10 : rate * 5] = -10000  # short pause is bridged
+    sound[rate * 8 : rate * 8 + 160] = 10000  # click shorter than min_speech
+
+    jsr = energy_vad(sound, frame=0.01, hangover=0.2, min_speech=0.5)
+
+    assert len(jsr) == 1
+    assert list(jsr[0]) == ["speech"]
+    assert jsr[0]["speech"]["time_start"] == pytest.approx(2.0)
+    assert jsr[0]["speech"]["time_end"] == pytest.approx(5.2)
+    assert jsr[0]["speech"]["duration"] == pytest.approx(3.2)
+
+
+def test_energy_vad_zcr():
+    sound = np.tile(np.array([300, -300], dtype=np.int16), 8000)  # quiet hiss
+    assert energy_vad(sound) == []
+    assert len(energy_vad(sound, zcr_threshold=0.5)) == 1
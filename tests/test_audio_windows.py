@@ -0,0 +1,55 @@
+from os import path
+import io
+import sys
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from ai_common_utils.audio import iter_audio_batches, iter_audio_windows
+
+
+@pytest.mark.parametrize("n_samples", [5, 10, 14, 16, 23, 24, 25])
+def test_stream_windows_match_array(n_samples):
+    sound = np.arange(1, n_samples + 1, dtype=np.int16)
+    windows = list(iter_audio_windows(sound, window=8, overlap=2, rate=1))
+    stream = [
+        (w.time_start, w.time_end, w.samples.copy())
+        for w in iter_audio_windows(
+            io.BytesIO(sound.tobytes()), window=8, overlap=2, rate=1, chunk_size=3
+        )
+    ]
+
+    assert [(w.time_start, w.time_end) for w in windows] == [
+        (t_start, t_end) for t_start, t_end, _ in stream
+    ]
+    for window, (_, _, samples) in zip(windows, stream):
+        assert window.samples.size == 8
+        assert (window.samples == samples).all()
+    assert windows[0].time_start == 0
+    assert windows[-1].time_end == n_samples
+
+
+def test_windows_zero_copy():
+    sound = np.arange(100, dtype=np.int16)
+    windows = list(iter_audio_windows(sound, window=30, overlap=5, rate=1))
+    assert [w.time_start for w in windows] == [0, 25, 50, 75]
+    assert np.shares_memory(windows[1].samples, sound)
+    assert windows[-1].time_end == 100 and windows[-1].samples[25:].sum() == 0
+
+
+def test_audio_batches():
+    sound = np.full(100, 16384, dtype=np.int16)
+    out = np.empty((3, 30), dtype=np.float32)
+    batches = [
+        (batch.shape, times)
+        for batch, times in iter_audio_batches(
+            sound, 3, window=30, overlap=5, rate=1, out=out
+        )
+    ]
+
+    assert batches[0] == ((3, 30), [(0, 30), (25, 55), (50, 80)])
+    assert batches[1] == ((1, 30), [(75, 100)])
+    assert out[0, 0] == 0.5 and out[0, 25:].sum() == 0
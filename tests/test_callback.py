@@ -0,0 +1,268 @@
+from os import path
+import asyncio
+import datetime
+import multiprocessing
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils.callback import (
+    AsyncReporter,
+    BaseCallback,
+    EtaCallback,
+    ProgressCallback,
+    SharedProgress,
+    SharedProgressHandle,
+    StopwatchCallback,
+    ThroughputEstimator,
+    TimerCallback,
+    call_callbacks,
+    callbacks_set_coeff,
+)
+
+
+def test_progress_callback_throttled():
+    reports = []
+    callback = ProgressCallback(1000, func_exec=reports.append, callback_interval=60)
+
+    for _ in range(1000):
+        callback.call(1)
+
+    # first call reports immediately, the rest are throttled
+    assert reports == [0.001]
+    assert callback.state == 1000
+    assert 1 < callback.check_every <= callback.MAX_CHECK_EVERY
+
+    callback.report()
+    assert reports[-1] == 1.0
+
+
+def test_progress_callback_interval():
+    reports = []
+    callback = ProgressCallback(10, func_exec=reports.append, callback_interval=0)
+
+    for _ in range(10):
+        callback(1)
+
+    assert len(reports) == 10
+    assert reports[-1] == 1.0
+
+
+def test_timer_callback():
+    reports = []
+    callback = TimerCallback(
+        100,
+        datetime.timedelta(seconds=100),
+        func_exec=reports.append,
+        callback_interval=0,
+    )
+
+    callback.call(25)
+    callback.call(datetime.timedelta(seconds=5))
+    assert reports == ["0:01:15", "0:01:10"]
+    assert callback.timer == datetime.timedelta(seconds=70)
+
+    callback.set_coeff(10)
+    callback.call(10)
+    assert callback.timer == datetime.timedelta(seconds=0)
+
+    with pytest.raises(ValueError):
+        callback.call(-1)
+
+    # steps over target_state only stop timer
+    callback = TimerCallback(10, datetime.timedelta(seconds=100))
+    callback.call(25)
+    assert callback.timer == datetime.timedelta(seconds=0)
+
+    # precomputed step is updated with attributes
+    callback = TimerCallback(10, datetime.timedelta(seconds=100), block_coeff=True)
+    callback.set_coeff(10)
+    callback.call(1)
+    assert callback.timer == datetime.timedelta(seconds=90)
+    callback.target_state = 100
+    callback.block_coeff = False
+    callback.call(1)
+    assert callback.timer == datetime.timedelta(seconds=80)
+
+
+def test_base_callback_abstract():
+    with pytest.raises(TypeError):
+        BaseCallback()
+
+
+def test_stopwatch_callback():
+    reports = []
+    start_time = datetime.datetime.now() - datetime.timedelta(hours=1)
+    callback = StopwatchCallback(start_time, reports.append, callback_interval=60)
+
+    callback.call()
+    callback.call()
+    assert len(reports) == 1 and reports[0].startswith("1:00:")
+    assert callback.time_now >= datetime.timedelta(hours=1)
+
+
+def test_call_callbacks():
+    callbacks = [ProgressCallback(10), ProgressCallback(10)]
+
+    callbacks_set_coeff(2, callbacks)
+    call_callbacks(3, callbacks)
+    call_callbacks(1, None)
+
+    assert [callback.state for callback in callbacks] == [6, 6]
+
+
+def test_async_reporter_coalescing():
+    reports = []
+    released = threading.Event()
+
+    def slow_func_exec(value):
+        released.wait()
+        reports.append(value)
+
+    callback = ProgressCallback(100, func_exec=slow_func_exec)
+    with AsyncReporter(callback, callback_interval=0.001) as reporter:
+        # hot path isn't blocked by slow func_exec
+        t = time.perf_counter()
+        for _ in range(100):
+            callback(1)
+        assert time.perf_counter() - t < 1
+        released.set()
+
+    assert callback.func_exec is slow_func_exec
+    assert len(reports) <= 3 and reports[-1] == 1.0
+    assert reporter.callback is callback
+
+
+def test_async_reporter_asyncio():
+    reports = []
+
+    async def func_exec(value):
+        reports.append(value)
+
+    async def main():
+        callback = ProgressCallback(10, func_exec=func_exec)
+        async with AsyncReporter(callback, 0.001, start=False) as reporter:
+            task = asyncio.ensure_future(reporter.arun())
+            for _ in range(10):
+                callback(1)
+                await asyncio.sleep(0.005)
+        await task
+
+    asyncio.run(main())
+
+    assert reports[0] < 1.0 and reports[-1] == 1.0
+    assert reports == sorted(reports)
+
+
+def test_callbacks_accept_kwds():
+    callbacks = [
+        ProgressCallback(10),
+        TimerCallback(10, datetime.timedelta(seconds=10)),
+        EtaCallback(10),
+        StopwatchCallback(datetime.datetime.now()),
+    ]
+    for callback in callbacks:
+        callback(1, "arg", key="value")
+    assert callbacks[0].state == 1
+
+
+def _work(n_steps: int, handle: SharedProgressHandle):
+    counter = handle.attach(coeff=0.5)
+    for _ in range(n_steps):
+        counter(2)
+    return n_steps
+
+
+def test_shared_progress():
+    reports = []
+    callback = ProgressCallback(400, func_exec=reports.append, callback_interval=0)
+
+    with SharedProgress([callback], n_slots=4, callback_interval=0.01) as progress:
+        with multiprocessing.Pool(3, **progress.pool_kwargs()) as pool:
+            assert sum(pool.starmap(_work, [(50, progress.handle)] * 6)) == 300
+
+        progress.handle.attach()(100)
+
+    assert progress.state == 400
+    assert callback.state == 400
+    assert reports[-1] == 1.0
+
+
+def _slot(handle: SharedProgressHandle):
+    counter = handle.attach()
+    counter(1)
+    return counter.slot
+
+
+def test_shared_progress_slots():
+    with SharedProgress(n_slots=8, callback_interval=0.01) as progress:
+        with multiprocessing.Pool(
+            2, maxtasksperchild=1, **progress.pool_kwargs()
+        ) as pool:
+            slots = pool.map(_slot, [progress.handle] * 4)
+        assert sorted(set(slots)) == sorted(slots)
+        assert 0 not in slots
+    assert progress.state == 4
+
+    with SharedProgress(n_slots=1) as progress:
+        with multiprocessing.Pool(1, **progress.pool_kwargs()) as pool:
+            with pytest.raises(ValueError):
+                pool.apply(_slot, (progress.handle,))
+        with multiprocessing.Pool(1) as pool:
+            with pytest.raises(ValueError):
+                pool.apply(_slot, (progress.handle,))
+
+
+def test_throughput_estimator():
+    estimator = ThroughputEstimator(half_life=1, min_interval=0.5)
+    assert estimator.eta(100) is None
+
+    estimator.update(0, now_ns=0)
+    estimator.update(10, now_ns=int(0.25e9))
+    assert estimator.rate is None
+
+    estimator.update(10, now_ns=int(1e9))
+    assert estimator.rate == pytest.approx(20)
+    assert estimator.eta(100) == pytest.approx(5)
+
+    # after half_life the new measurement has half of weight
+    estimator.update(40, now_ns=int(2e9))
+    assert estimator.rate == pytest.approx(30)
+    assert estimator.items == 60
+
+
+def test_eta_callback():
+    reports = []
+    estimator = ThroughputEstimator(min_interval=0)
+    callback = EtaCallback(
+        1000,
+        func_exec=reports.append,
+        callback_interval=0,
+        estimator=estimator,
+        item_duration=1,
+    )
+
+    callback(10)
+    assert reports[0] == {
+        "progress": 0.01,
+        "eta": None,
+        "items_per_sec": None,
+        "rtf": None,
+    }
+
+    time.sleep(0.01)
+    callback(1500)
+    report = reports[-1]
+    assert report["progress"] == 1.51 and report["eta"] == 0
+    assert report["items_per_sec"] > 0
+    assert report["rtf"] == pytest.approx(1 / report["items_per_sec"])
+
+    callback.start_stage(100)
+    value = callback.value()
+    assert value["progress"] == 0 and value["eta"] == pytest.approx(
+        100 / estimator.rate
+    )
@@ -4,7 +4,13 @@ import sys
 
 sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
 
-from ai_common_utils.date_and_time import format_time
+import pytest
+
+from ai_common_utils.date_and_time import (
+    format_seconds,
+    format_seconds_batch,
+    format_time,
+)
 
 
 def test_format_time():
@@ -13,3 +19,28 @@ def test_format_time():
     dt = t2 - t1
 
     assert format_time(dt) == "21:10:19"
+
+
+def test_format_time_ms():
+    assert format_time(datetime.timedelta(seconds=3725.5)) == "01:02:05.500"
+
+
+def test_format_seconds():
+    assert format_seconds(3725.5) == "01:02:05,500"
+    assert format_seconds(3725.5, "vtt") == "01:02:05.500"
+    assert format_seconds(3725.5, "plain") == "01:02:05"
+    assert format_seconds(-1) == "00:00:00,000"
+    assert format_seconds(360000) == "100:00:00,000"
+
+
+def test_format_seconds_batch():
+    pytest.importorskip("numpy")
+    times = [0, 0.0004, 1.0005, 59.9999, 3725.5, 86399.999]
+    for fmt in ("srt", "vtt", "plain"):
+        assert format_seconds_batch(times, fmt) == [
+            format_seconds(t, fmt) for t in times
+        ]
+    assert format_seconds_batch([360000, 1], "srt") == [
+        "100:00:00,000",
+        "00:00:01,000",
+    ]
@@ -0,0 +1,233 @@
+from os import path
+import base64
+import copy
+import gzip
+import io
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils import files
+from ai_common_utils.files import (
+    convert_from,
+    convert_to,
+    iter_convert_from,
+    iter_convert_to,
+    JsonCache,
+    BackgroundWriter,
+    append_jsonl,
+    iter_jsonl,
+    open_jsonl,
+    save_jsonl,
+    split_jsonl,
+    open_json,
+    open_list_rttm,
+    recompress_files,
+    save_json,
+    save_list_rttm,
+)
+
+JSR = [{"speaker": {"idx": "a"}, "speech": {"time_start": 0.5, "text": "hi"}}]
+RTTM = [["SPEAKER", "f", "1", "0.5", "1.0", "<NA>", "<NA>", "a", "1", "<NA>"]]
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+def test_compressed_json_and_rttm(tmp_path, suffix):
+    path_json = str(tmp_path / f"data.jsr.json{suffix}")
+    save_json(path_json, JSR, compresslevel=1)
+    assert open_json(path_json) == JSR
+
+    path_rttm = str(tmp_path / f"data.rttm{suffix}")
+    save_list_rttm(path_rttm, RTTM)
+    assert open_list_rttm(path_rttm) == RTTM
+
+    if suffix == ".gz":
+        with gzip.open(path_json) as f:
+            assert f.read().startswith(b"[")
+
+
+def test_recompress_files(tmp_path):
+    for i in range(3):
+        save_json(str(tmp_path / f"{i}.json"), JSR)
+    save_json(str(tmp_path / "3.json.gz"), JSR)
+
+    paths = recompress_files(str(tmp_path), ".xz", workers=2)
+    assert sorted(os.listdir(tmp_path)) == [f"{i}.json.xz" for i in range(4)]
+    assert all(open_json(path_json) == JSR for path_json in paths)
+
+    recompress_files(str(tmp_path), "")
+    assert sorted(os.listdir(tmp_path)) == [f"{i}.json" for i in range(4)]
+
+
+@pytest.mark.parametrize("suffix", ["", ".gz"])
+def test_jsonl(tmp_path, suffix):
+    path_jsonl = str(tmp_path / f"data.jsonl{suffix}")
+    records = [{"i": i, "text": "строка\nline" * (i % 7)} for i in range(100)]
+
+    save_jsonl(path_jsonl, records[:50])
+    append_jsonl(path_jsonl, records[50:])
+    assert open_jsonl(path_jsonl) == records
+
+
+@pytest.mark.parametrize("n_shards", [1, 3, 7, 1000])
+def test_jsonl_shards(tmp_path, n_shards):
+    path_jsonl = str(tmp_path / "data.jsonl")
+    records = [{"i": i, "pad": "x" * (i % 13)} for i in range(200)]
+    save_jsonl(path_jsonl, records)
+
+    shards = split_jsonl(path_jsonl, n_shards)
+    assert shards[0][0] == 0 and shards[-1][1] == os.path.getsize(path_jsonl)
+    assert [
+        record for start, end in shards for record in iter_jsonl(path_jsonl, start, end)
+    ] == records
+
+
+@pytest.mark.parametrize("fsync", ["never", "always", "flush"])
+def test_background_writer(tmp_path, fsync):
+    with BackgroundWriter(max_queue=2, fsync=fsync) as writer:
+        futures = [
+            save_json(str(tmp_path / f"{i}.json.gz"), JSR, writer=writer)
+            for i in range(10)
+        ]
+        future_rttm = save_list_rttm(str(tmp_path / "data.rttm"), RTTM, writer=writer)
+        writer.flush()
+        assert all(future.done() for future in futures)
+
+    assert [future.result() for future in futures] == [
+        str(tmp_path / f"{i}.json.gz") for i in range(10)
+    ]
+    assert open_json(futures[0].result()) == JSR
+    assert open_list_rttm(future_rttm.result()) == RTTM
+    assert sorted(os.listdir(tmp_path))[-1] == "data.rttm"  # no temp files left
+
+    with pytest.raises(RuntimeError):
+        writer.submit(str(tmp_path / "data.json"), b"{}")
+
+
+def test_background_writer_errors(tmp_path, monkeypatch):
+    writer = BackgroundWriter()
+    error = writer.submit(str(tmp_path / "not_exist" / "data.json"), b"{}")
+    with pytest.raises(FileNotFoundError):
+        writer.flush()
+    assert isinstance(error.exception(), FileNotFoundError)
+    assert writer.submit(str(tmp_path / "data.json"), b"{}").result()
+    writer.flush()
+
+    def fsync_error(path, directory=False):
+        raise OSError("fsync failed")
+
+    monkeypatch.setattr(files, "_fsync_path", fsync_error)
+    writer.fsync = "flush"
+    writer.submit(str(tmp_path / "data.json"), b"{}").result()
+    # worker thread survives error of fsync
+    with pytest.raises(OSError):
+        writer.flush(timeout=5)
+    monkeypatch.undo()
+
+    writer.submit(str(tmp_path / "data.json"), b"{}").result()
+    writer.close()
+    assert not os.path.exists(str(tmp_path / "not_exist"))
+
+
+def test_json_cache(tmp_path):
+    path_json = str(tmp_path / "config.json")
+    save_json(path_json, {"a": [1, {"b": 2}]})
+    cache = JsonCache(maxsize=1)
+
+    frozen = cache.get(path_json, frozen=True)
+    assert frozen == {"a": (1, {"b": 2})}
+    assert cache.get(path_json, frozen=True) is frozen
+    with pytest.raises(TypeError):
+        frozen["a"] = 1
+    assert copy.deepcopy(frozen) == {"a": [1, {"b": 2}]}
+
+    data = cache.get(path_json)
+    data["a"].append(3)
+    assert cache.get(path_json) == {"a": [1, {"b": 2}]}
+
+    reloads = []
+    cache.add_reload_callback(lambda path, data: reloads.append((path, data)))
+    save_json(path_json, {"a": 2, "c": 3})
+    assert cache.check() == [path_json]
+    assert reloads == [(path_json, {"a": 2, "c": 3})]
+    assert cache.get(path_json, frozen=True) == {"a": 2, "c": 3}
+    assert open_json(path_json, cached=True) == {"a": 2, "c": 3}
+
+
+def test_json_cache_watch_errors(tmp_path):
+    path_json = str(tmp_path / "config.json")
+    save_json(path_json, {"a": 1})
+    cache = JsonCache()
+    cache.get(path_json)
+
+    reloads = []
+
+    def fail(path, data):
+        raise RuntimeError("callback failed")
+
+    cache.add_reload_callback(fail)
+    cache.add_reload_callback(lambda path, data: reloads.append(data["a"]))
+    cache.watch(interval=0.01)
+    try:
+        for i in range(2, 4):
+            save_json(path_json, {"a": i, "pad": "x" * i})
+            for _ in range(500):
+                if reloads and reloads[-1] == i:
+                    break
+                time.sleep(0.01)
+    finally:
+        cache.stop_watch()
+    assert reloads == [2, 3]
+
+
+@pytest.mark.parametrize("convert", [["base64"], ["base64", "json"], ["frame"]])
+@pytest.mark.parametrize("chunk_size", [5, 4096])
+def test_stream_convert(convert, chunk_size):
+    data = os.urandom(10001)
+
+    encoded = b"".join(iter_convert_to(io.BytesIO(data), convert, chunk_size))
+    if "frame" not in convert:
+        assert encoded.decode("utf-8") == convert_to(data, convert)
+        assert convert_from(encoded.decode("utf-8"), convert[::-1]) == data
+
+    decoded = iter_convert_from(io.BytesIO(encoded), convert[::-1], chunk_size)
+    assert b"".join(decoded) == data
+
+
+def test_stream_convert_json():
+    data = {"text": 'привет "мир"\n', "values": [1, 2.5, None]}
+    encoded = b"".join(iter_convert_to(data, ["json", "base64"], chunk_size=3))
+    assert base64.b64decode(encoded) == convert_to(data, ["json"]).encode("utf-8")
+    assert list(iter_convert_from(encoded, ["base64", "json"], chunk_size=3)) == [data]
+
+
+def test_stream_convert_json_bytes_chunks():
+    # bytes input is split into memoryview chunks
+    decoded = iter_convert_from(b'"abcdef"      ', ["json"], chunk_size=3)
+    assert b"".join(decoded) == b"abcdef"
+
+    assert list(iter_convert_from(b' {"a": [1, 2]}  ', ["json"], chunk_size=2)) == [
+        {"a": [1, 2]}
+    ]
+
+    with pytest.raises(ValueError):
+        list(iter_convert_from(b'"abc"   x', ["json"], chunk_size=3))
+
+
+def test_stream_convert_json_surrogate_pair():
+    encoded = b'"a\\uD83D\\uDE00b \\\\uD83D \\u00e9"'
+    expected = json.loads(encoded).encode("utf-8")
+    for offset in range(1, len(encoded)):
+        chunks = [encoded[:offset], encoded[offset:]]
+        assert b"".join(iter_convert_from(chunks, ["json"])) == expected
+    for chunk_size in range(1, len(encoded) + 1):
+        decoded = iter_convert_from(encoded, ["json"], chunk_size=chunk_size)
+        assert b"".join(decoded) == expected
+
+    with pytest.raises(ValueError):
+        b"".join(iter_convert_from(b'"\\uD83Dx"', ["json"], chunk_size=2))
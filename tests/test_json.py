@@ -0,0 +1,170 @@
+from os import path
+import json
+import sys
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils import json as json_utils
+from ai_common_utils.files import open_json, save_json
+
+DATA = {"b": [1, 2.5, None, True], "a": {"text": "привет / hi"}}
+
+
+@pytest.mark.parametrize("backend", json_utils.JSON_BACKENDS)
+@pytest.mark.parametrize("pretty", [True, False])
+def test_json_backends(tmp_path, backend, pretty):
+    try:
+        json_utils.set_json_backend(backend)
+    except ImportError:
+        pytest.skip(f"{backend} not installed")
+
+    try:
+        path_json = str(tmp_path / "data.json")
+        save_json(path_json, DATA, pretty=pretty)
+        assert open_json(path_json) == DATA
+
+        with open(path_json, "rb") as f:
+            data = f.read()
+        assert ("привет" in data.decode("utf-8")) and (b"\n" in data) == pretty
+        # non-str keys fall back to stdlib
+        assert json_utils.loads(json_utils.dumps({1: "a"})) == {"1": "a"}
+    finally:
+        json_utils.set_json_backend()
+
+
+def _backends():
+    for backend in json_utils.JSON_BACKENDS:
+        try:
+            json_utils.set_json_backend(backend)
+        except ImportError:
+            continue
+        try:
+            yield backend
+        finally:
+            json_utils.set_json_backend()
+
+
+def test_numpy_encoder():
+    np = pytest.importorskip("numpy")
+
+    data = {
+        "ints": np.arange(3, dtype=np.int64),
+        "emb": np.ones((2, 2), dtype=np.float32)[:, ::-1],
+        "score": np.float32(0.5),
+        "n": np.int16(7),
+        "ok": np.bool_(True),
+    }
+    expected = {
+        "ints": [0, 1, 2],
+        "emb": [[1.0, 1.0], [1.0, 1.0]],
+        "score": 0.5,
+        "n": 7,
+        "ok": True,
+    }
+    assert json.loads(json.dumps(data, cls=json_utils.NumpyEncoder)) == expected
+
+    for _ in _backends():
+        assert json.loads(json_utils.dumps_numpy(data)) == expected
+        assert json.loads(json_utils.dumps_numpy(data, pretty=True)) == expected
+
+
+def test_numpy_binary_roundtrip():
+    np = pytest.importorskip("numpy")
+
+    emb = np.random.rand(4, 8).astype(np.float32)
+    data = {"tokens": [{"word": "a", "emb": emb}], "small": np.arange(2)}
+
+    for _ in _backends():
+        result = json_utils.loads_numpy(
+            json_utils.dumps_numpy(data, binary_threshold=4)
+        )
+        loaded = result["tokens"][0]["emb"]
+        assert loaded.dtype == np.float32 and loaded.shape == (4, 8)
+        assert np.array_equal(loaded, emb)
+        assert result["small"] == [0, 1]
+
+    encoded = json.dumps(data, cls=json_utils.NumpyEncoder, binary_threshold=4)
+    loaded = json.loads(encoded, object_hook=json_utils.numpy_object_hook)
+    assert np.array_equal(loaded["tokens"][0]["emb"], emb)
+
+
+@pytest.mark.parametrize("backend", json_utils.JSON_BACKENDS)
+def test_json_nan_roundtrip(tmp_path, backend):
+    try:
+        json_utils.set_json_backend(backend)
+    except ImportError:
+        pytest.skip(f"{backend} not installed")
+
+    try:
+        path_json = str(tmp_path / "data.json")
+        # file written by stdlib json
+        with open(path_json, "w") as f:
+            json.dump({"conf": float("nan"), "end": float("inf")}, f)
+        data = open_json(path_json)
+        assert data["conf"] != data["conf"] and data["end"] == float("inf")
+
+        for pretty in (True, False):
+            encoded = json_utils.dumps({"conf": [float("nan")]}, pretty=pretty)
+            assert b"NaN" in encoded
+            loaded = json_utils.loads(encoded)["conf"][0]
+            assert loaded != loaded
+    finally:
+        json_utils.set_json_backend()
+
+
+@pytest.mark.parametrize("backend", json_utils.JSON_BACKENDS)
+def test_json_nan_numpy_scalars(backend):
+    np = pytest.importorskip("numpy")
+    try:
+        json_utils.set_json_backend(backend)
+    except ImportError:
+        pytest.skip(f"{backend} not installed")
+
+    try:
+        # np.float64 is float subclass, serialized by `dumps` too
+        assert json_utils.dumps({"x": np.float64("nan")}) == b'{"x":NaN}'
+        assert json_utils.dumps({"x": [np.float64("-inf")]}) == b'{"x":[-Infinity]}'
+        for value in (np.float32("nan"), np.float16("inf"), np.complex64(np.nan)):
+            assert json_utils._has_nonfinite({"x": [value]})
+        assert not json_utils._has_nonfinite({"x": np.float32(1)})
+    finally:
+        json_utils.set_json_backend()
+
+
+@pytest.mark.parametrize("backend", json_utils.JSON_BACKENDS)
+def test_json_pretty_indent(backend):
+    try:
+        json_utils.set_json_backend(backend)
+    except ImportError:
+        pytest.skip(f"{backend} not installed")
+
+    try:
+        data = {"b": {"c": 1}, "a": "привет"}
+        expected = json.dumps(data, indent=4, sort_keys=True, ensure_ascii=False)
+        assert json_utils.dumps(data, pretty=True) == expected.encode("utf-8")
+    finally:
+        json_utils.set_json_backend()
+
+
+@pytest.mark.parametrize("backend", json_utils.JSON_BACKENDS)
+@pytest.mark.parametrize("binary_threshold", [None, 4])
+def test_dumps_numpy_nan_scalars(backend, binary_threshold):
+    np = pytest.importorskip("numpy")
+    try:
+        json_utils.set_json_backend(backend)
+    except ImportError:
+        pytest.skip(f"{backend} not installed")
+
+    try:
+        data = {"x": np.float32("nan"), "y": [np.float16("-inf"), np.int64(1)]}
+        expected = json.dumps(
+            data, cls=json_utils.NumpyEncoder, separators=(",", ":")
+        ).encode("utf-8")
+        assert expected == b'{"x":NaN,"y":[-Infinity,1]}'
+        assert json_utils.dumps_numpy(data, binary_threshold=binary_threshold) == (
+            expected
+        )
+    finally:
+        json_utils.set_json_backend()
@@ -0,0 +1,45 @@
+from os import path
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+import ai_common_utils
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+
+
+def _loaded_modules(statement: str) -> set:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            statement + "\nimport sys\nprint(' '.join(sys.modules))",
+        ],
+        cwd=ROOT,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert "not installed" not in result.stderr
+    return set(result.stdout.split())
+
+
+def test_lazy_import():
+    modules = _loaded_modules("import ai_common_utils")
+    assert "ai_common_utils" in modules
+    assert not {"ai_common_utils.audio", "ai_common_utils.files", "numpy"} & modules
+
+    modules = _loaded_modules("from ai_common_utils import rttm")
+    assert not {"ai_common_utils.audio", "numpy"} & modules
+
+
+def test_lazy_attributes():
+    assert ai_common_utils.date_and_time.format_seconds(1.5) == "00:00:01,500"
+    assert "srt" in dir(ai_common_utils)
+
+    with pytest.raises(AttributeError):
+        ai_common_utils.missing
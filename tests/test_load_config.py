@@ -3,8 +3,98 @@ import sys
 
 sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
 
+from ai_common_utils import config as config_module
 from ai_common_utils.config import load_config
 
 
 def test_load_config():
     assert load_config(level=1) == {"test": True}
+
+
+def test_load_config_cached():
+    config = load_config(level=1, frozen=True)
+    assert config == {"test": True}
+    assert load_config(level=1, frozen=True) is config
+    assert load_config(level=1, cached=True) is not config
+
+
+def test_load_config_layered(tmp_path, monkeypatch):
+    path_env = tmp_path / ".env"
+    path_env.write_text("TEST_CFG_DB__PORT=5433\nTEST_CFG_NAME=from env file\n")
+    monkeypatch.setenv("TEST_CFG_NAME", "from environ")
+    monkeypatch.setenv("TEST_CFG_DEBUG", "false")
+    # restored after test, although env file sets it
+    monkeypatch.setenv("TEST_CFG_DB__PORT", "")
+    monkeypatch.delenv("TEST_CFG_DB__PORT")
+
+    defaults = {"DB": {"host": "localhost", "port": 5432}, "test": False}
+    kwargs = dict(defaults=defaults, env_file=str(path_env), env_prefix="TEST_CFG_")
+
+    config = load_config(level=1, frozen=True, **kwargs)
+    assert config == {
+        "DB": {"host": "localhost", "port": 5433},
+        "test": True,
+        "name": "from environ",
+        "debug": False,
+    }
+    assert load_config(level=1, frozen=True, **kwargs) is config
+
+    mutable = load_config(level=1, **kwargs)
+    mutable["test"] = False
+    assert mutable is not config and config["test"] is True
+
+    assert load_config({"test": 1}, defaults={"a": 1}) == {"a": 1, "test": 1}
+
+
+def test_load_config_layered_changes(monkeypatch):
+    monkeypatch.setenv("TEST_CFG2_NAME", "first")
+    defaults = {"a": 1}
+    config = load_config(
+        level=1, frozen=True, defaults=defaults, env_prefix="TEST_CFG2_"
+    )
+    assert config == {"a": 1, "test": True, "name": "first"}
+
+    monkeypatch.setenv("TEST_CFG2_NAME", "second")
+    assert load_config(level=1, defaults=defaults, env_prefix="TEST_CFG2_")["name"] == (
+        "second"
+    )
+
+    defaults["a"] = 2
+    assert load_config(level=1, defaults=defaults, env_prefix="TEST_CFG2_")["a"] == 2
+
+    data = {"test": 1}
+    assert load_config(data, defaults={}) == {"test": 1}
+    data["test"] = 2
+    assert load_config(data, defaults={}) == {"test": 2}
+
+
+def test_load_config_layered_bounded():
+    for i in range(config_module.MAX_LAYERED_CONFIGS + 10):
+        load_config(level=1, defaults={"i": i})
+    assert len(config_module._LAYERED_CONFIGS) <= config_module.MAX_LAYERED_CONFIGS
+
+
+def test_load_config_layered_cache(tmp_path, monkeypatch):
+    path_env = tmp_path / ".env"
+    path_env.write_text("TEST_CFG3_NAME=from env file\n")
+    # restored after test, although env file sets it
+    monkeypatch.setenv("TEST_CFG3_NAME", "")
+    monkeypatch.delenv("TEST_CFG3_NAME")
+    loads = []
+    load_env_file = config_module.load_env_file
+    monkeypatch.setattr(
+        config_module,
+        "load_env_file",
+        lambda *args, **kwargs: loads.append(args) or load_env_file(*args, **kwargs),
+    )
+
+    kwargs = dict(env_file=str(path_env), env_prefix="TEST_CFG3_")
+    config_module.clear_config_cache()
+    configs = [
+        load_config(level=1, frozen=True, defaults={"a": [1, {"b": 2}]}, **kwargs)
+        for _ in range(5)
+    ]
+    assert all(config is configs[0] for config in configs)
+    assert configs[0] == {"a": (1, {"b": 2}), "test": True, "name": "from env file"}
+    assert len(loads) == 1
+    assert len(config_module._LAYERED_CONFIGS) == 1
@@ -0,0 +1,97 @@
+from os import path
+import datetime
+import json
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils import profiler
+from ai_common_utils.callback import StopwatchCallback
+from ai_common_utils.files import save_json
+from ai_common_utils.jsr import rttm2jsr
+from ai_common_utils.srt import jsr2srt
+
+RTTM = "SPEAKER audio 1 0.00 1.50 <NA> <NA> anna 0.9 <NA>"
+
+
+@pytest.fixture
+def enabled():
+    profiler.reset()
+    profiler.enable(trace_memory=True)
+    yield
+    profiler.disable()
+    profiler.reset()
+
+
+def test_profiler_disabled():
+    profiler.reset()
+    with profiler.stage("pipeline"):
+        rttm2jsr(RTTM)
+    assert profiler.get_stats() == {}
+    assert profiler.current_stage() == ""
+
+
+def test_profiler_stages(tmp_path, enabled):
+    with profiler.stage("pipeline"):
+        for _ in range(2):
+            jsr = rttm2jsr(RTTM)
+        jsr[0]["speech"]["text"] = "hi"
+        with profiler.stage("export"):
+            assert profiler.current_stage() == "pipeline/export"
+            jsr2srt(jsr)
+            save_json(str(tmp_path / "out.json"), [list(range(1000))])
+
+    stats = profiler.get_stats()
+    assert stats["pipeline/jsr.rttm2jsr"]["calls"] == 2
+    assert stats["pipeline/export/srt.jsr2srt"]["calls"] == 1
+    assert stats["pipeline/export/files.save_json"]["bytes"] > 4000
+    assert stats["pipeline/export/files.save_json"]["peak_memory"] > 0
+    assert stats["pipeline"]["wall_time"] >= stats["pipeline/export"]["wall_time"]
+
+    (root,) = profiler.get_stage_tree()
+    assert root["name"] == "pipeline"
+    assert [child["name"] for child in root["children"]] == [
+        "export",
+        "jsr.rttm2jsr",
+    ]
+
+    profiler.save_json(str(tmp_path / "profile.json"))
+    with open(tmp_path / "profile.json") as f:
+        assert json.load(f)[0]["children"][1]["calls"] == 2
+
+    profiler.save_prometheus(str(tmp_path / "profile.prom"))
+    with open(tmp_path / "profile.prom") as f:
+        prom = f.read()
+    assert "# TYPE ai_common_utils_stage_calls_total counter" in prom
+    assert 'ai_common_utils_stage_calls_total{stage="pipeline/jsr.rttm2jsr"} 2' in prom
+
+
+def test_profiler_stage_callbacks():
+    reports = []
+    callback = StopwatchCallback(datetime.datetime.now(), reports.append, 0)
+
+    @profiler.stage("decode", callbacks=[callback])
+    def decode():
+        pass
+
+    decode()
+    decode()
+    assert len(reports) == 2
+
+
+def test_profiler_keeps_external_tracemalloc():
+    tracemalloc.start()
+    try:
+        profiler.enable(trace_memory=True)
+        profiler.disable()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    profiler.enable(trace_memory=True)
+    assert tracemalloc.is_tracing()
+    profiler.disable()
+    assert not tracemalloc.is_tracing()
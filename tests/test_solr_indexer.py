@@ -0,0 +1,84 @@
+from os import path
+import sys
+
+import pytest
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils.solr_indexer import SolrIndexer, index_solr
+from ai_common_utils.solr_parser import iter_dict_2_solr
+from tests.mock_solr import MockSolr
+
+
+def test_solr_indexer_batching():
+    server = MockSolr()
+    data = {
+        f"doc{i}": {"text": f"text {i}", "ner": {"person": "Anna"}} for i in range(2500)
+    }
+
+    try:
+        stats = index_solr(
+            iter_dict_2_solr(data), server.url, batch_size=1000, workers=2
+        )
+    finally:
+        server.shutdown()
+
+    assert sorted(len(batch) for batch in server.batches) == [500, 1000, 1000]
+    ids = {doc["id"] for batch in server.batches for doc in batch}
+    assert len(ids) == 2500
+    assert server.batches[0][0]["person_ner_NLP"] == "Anna"
+    assert server.commits == 1
+    # keep-alive connections are reused
+    assert server.connections <= 2
+    assert stats["docs"] == 2500 and stats["batches"] == 3
+
+
+def test_solr_indexer_batch_bytes_and_retries():
+    server = MockSolr(fail_first=2)
+
+    try:
+        with SolrIndexer(
+            server.url, batch_bytes=1000, workers=1, backoff=0.01
+        ) as indexer:
+            indexer.add_many({"id": str(i), "text": "x" * 90} for i in range(50))
+    finally:
+        server.shutdown()
+
+    assert 900 < server.max_body <= 1000
+    assert sum(len(batch) for batch in server.batches) == 50
+    assert indexer.stats["retries"] == 2
+    assert server.commits == 1
+
+
+def test_solr_indexer_errors():
+    server = MockSolr(fail_first=100, status=400)
+
+    try:
+        indexer = SolrIndexer(server.url, batch_size=10, backoff=0.01)
+        indexer.add_many({"id": str(i)} for i in range(10))
+        with pytest.raises(RuntimeError, match="HTTP 400"):
+            indexer.close()
+    finally:
+        server.shutdown()
+
+    # bad request isn't retried, nothing is committed
+    assert server.fail_first == 99
+    assert server.commits == 0
+
+
+def test_solr_indexer_abort():
+    server = MockSolr()
+
+    try:
+        with pytest.raises(KeyError):
+            with SolrIndexer(server.url, batch_size=10, workers=1) as indexer:
+                indexer.add_many({"id": str(i)} for i in range(25))
+                raise KeyError("id")
+    finally:
+        server.shutdown()
+
+    # current batch isn't sent, nothing is committed
+    assert sum(len(batch) for batch in server.batches) <= 20
+    assert server.commits == 0
+    with pytest.raises(ValueError):
+        indexer.add({"id": "1"})
@@ -0,0 +1,99 @@
+from os import path
+import sys
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+from ai_common_utils import solr_parser
+from ai_common_utils.solr_parser import (
+    iter_dict_2_solr,
+    parse_dict_2_solr,
+    parse_solr_2_dict,
+    rec_dict_2_solr,
+)
+
+DATA = {
+    "doc1": {
+        "raw_text": "hello\nworld",
+        "ner": {"person": "Anna\n", "org": {"name": "ACME", "score": 0.5}},
+        "empty": {},
+        "lang": "en",
+    },
+    "doc2": {"lang": "ru", "sentiment": {"label": "positive", "score": 0.9}},
+    "doc3": "not a dict",
+}
+
+
+def _legacy_parse(data, additional_name="NLP"):
+    solr_like = []
+    for key, doc in data.items():
+        inner_dict = {"id": key}
+        rec_dict_2_solr(inner_dict, additional_name, doc)
+        solr_like.append(inner_dict)
+    return solr_like
+
+
+def test_parse_dict_2_solr():
+    docs = parse_dict_2_solr(DATA)
+
+    assert docs == _legacy_parse(DATA)
+    assert docs[0] == {
+        "id": "doc1",
+        "raw_text": "helloworld",
+        "person_ner_NLP": "Anna",
+        "name_org_ner_NLP": "ACME",
+        "score_org_ner_NLP": 0.5,
+        "empty_NLP": {},
+        "lang_NLP": "en",
+    }
+    assert docs[2] == {"id": "doc3"}
+
+
+def test_iter_dict_2_solr_errors():
+    data = {"bad": {"raw_text": None}, "ok": {"a": 1}, "bad2": {1: 2}, "ok2": {}}
+    errors = []
+
+    docs = iter_dict_2_solr(data, "X", errors=errors)
+    assert next(docs) == {"id": "ok", "a_X": 1}
+
+    assert list(docs) == [{"id": "ok2"}]
+    assert [doc_id for doc_id, _ in errors] == ["bad", "bad2"]
+
+    assert parse_dict_2_solr(iter(data.items()), "X") == [
+        {"id": "ok", "a_X": 1},
+        {"id": "ok2"},
+    ]
+
+
+def test_iter_dict_2_solr_cache_bounded(monkeypatch):
+    monkeypatch.setattr(solr_parser, "MAX_CACHED_NAMES", 50)
+    sizes = []
+    flatten_doc = solr_parser._flatten_doc
+
+    def _flatten_doc(doc_id, doc, name, prefixes):
+        result = flatten_doc(doc_id, doc, name, prefixes)
+        sizes.append(len(prefixes) + sum(len(names) for names in prefixes.values()))
+        return result
+
+    monkeypatch.setattr(solr_parser, "_flatten_doc", _flatten_doc)
+    # many distinct keys under the same prefix
+    data = ((str(i), {"ner": {f"key{i}": i, f"other{i}": i}}) for i in range(1000))
+    docs = list(iter_dict_2_solr(data))
+
+    assert docs[999] == {"id": "999", "key999_ner_NLP": 999, "other999_ner_NLP": 999}
+    assert max(sizes) <= 50 + 5
+
+
+def test_parse_solr_2_dict():
+    data = {"d": {"lang": "en", "sentiment": {"label": "neutral", "score": 0.1}}}
+    assert parse_solr_2_dict(parse_dict_2_solr(data)) == data
+
+    data = {
+        "d": {
+            "raw_text": "text",
+            "speech": {"time_start": 1.0, "speaker_id": "a"},
+            "empty": {},
+        }
+    }
+    template = {"speech": {"time_start": 0, "speaker_id": ""}, "empty": {}}
+    docs = parse_dict_2_solr(data)
+    assert parse_solr_2_dict(docs, template=template) == data
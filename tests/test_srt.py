@@ -0,0 +1,205 @@
+from os import path
+import io
+import sys
+
+sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+import pytest
+
+from ai_common_utils.files import BackgroundWriter
+from ai_common_utils.srt import (
+    SubtitlesIndex,
+    SubtitlesWriter,
+    iter_jsr_cues,
+    iter_subtitles,
+    jsr2srt,
+    rttm2srt,
+    srt2jsr,
+)
+
+JSR = [
+    {
+        "speaker": {"idx": "speaker_1", "display_name": "Anna"},
+        "speech": {"time_start": 1.5, "time_end": 3.25, "text": "hello there"},
+    },
+    {"speech": {"time_start": 3661.0, "time_end": 3662.0, "text": "bye"}},
+]
+
+RTTM = [
+    [
+        "SPEAKER",
+        "f",
+        "1",
+        f"{i * 1.5}",
+        "1.25",
+        "<NA>",
+        "<NA>",
+        f"spk_{i % 2}/hi/##ya/w{i}",
+        "1",
+        "<NA>",
+    ]
+    for i in range(10)
+]
+
+
+class Punct:
+    def predict(self, tokens, key):
+        for token in tokens:
+            yield token, "U" if token[0] == 0 else "L", "," if token[0] % 2 else ""
+
+    def map_case_label(self, word, case_label):
+        return word.upper() if case_label == "U" else word
+
+    def map_punc_label(self, word, punc_label):
+        return word + punc_label
+
+
+def test_jsr2vtt():
+    assert jsr2srt(JSR, fmt="vtt") == (
+        "WEBVTT\n\n"
+        "1\n00:00:01.500 --> 00:00:03.250\nAnna: hello there\n\n"
+        "2\n01:01:01.000 --> 01:01:02.000\nbye\n\n"
+    )
+
+
+def test_subtitles_writer_stream():
+    f = io.StringIO()
+    with SubtitlesWriter(f) as writer:
+        writer.write_jsr(iter(JSR))
+
+    assert f.getvalue() == jsr2srt(JSR) == "".join(iter_jsr_cues(JSR))
+    assert f.getvalue().startswith("1\n")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"punct_batch_size": 3},
+        {"punct_workers": 2},
+        {
+            "punct_batch_func": lambda batch: [
+                Punct().predict(tokens, None) for tokens in batch
+            ]
+        },
+    ],
+)
+def test_rttm2srt_punct_batch(kwargs):
+    punct = Punct()
+    expected = rttm2srt(RTTM, punct=punct, speaker_idx2name={"spk_0": "Anna"})
+    assert expected.startswith(
+        "1\n00:00:00,000 --> 00:00:01,250\nAnna:  HI##ya, w0 ,\n\n"
+    )
+    assert (
+        rttm2srt(RTTM, punct=punct, speaker_idx2name={"spk_0": "Anna"}, **kwargs)
+        == expected
+    )
+
+
+class ContextPunct(Punct):
+    """
+    Context-sensitive stub: label of token depends on length of whole sequence.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, tokens, key):
+        self.calls += 1
+        tokens = list(tokens)
+        for token in tokens:
+            yield token, "U" if token[0] == 0 else "L", "." if len(tokens) > 6 else ""
+
+
+class BatchPunct(ContextPunct):
+    def __init__(self):
+        super().__init__()
+        self.batch_calls = 0
+
+    def predict_batch(self, tokens_batch, key):
+        self.batch_calls += 1
+        return [
+            list(ContextPunct.predict(self, tokens, key)) for tokens in tokens_batch
+        ]
+
+
+@pytest.mark.parametrize(
+    "punct_cls, kwargs, calls, batch_calls",
+    [
+        (ContextPunct, {}, 10, 0),
+        (ContextPunct, {"punct_batch_size": 5}, 10, 0),
+        (ContextPunct, {"punct_workers": 2}, 10, 0),
+        (BatchPunct, {"punct_batch_size": 5}, 10, 2),
+    ],
+)
+def test_rttm2srt_punct_batch_per_line(punct_cls, kwargs, calls, batch_calls):
+    expected = rttm2srt(RTTM, punct=ContextPunct(), speaker_idx2name={"spk_0": "Anna"})
+    punct = punct_cls()
+    srt = rttm2srt(RTTM, punct=punct, speaker_idx2name={"spk_0": "Anna"}, **kwargs)
+    # each line is predicted as separate sequence
+    assert srt == expected
+    assert punct.calls == calls
+    assert getattr(punct, "batch_calls", 0) == batch_calls
+
+
+def test_srt2jsr_roundtrip(tmp_path):
+    path_srt = str(tmp_path / "subs.srt")
+    srt = jsr2srt(JSR, path_srt)
+    jsr = srt2jsr(path_srt)
+
+    assert jsr[0]["speaker"] == {"idx": "Anna"}
+    assert jsr[0]["speech"] == {
+        "time_start": 1.5,
+        "time_end": 3.25,
+        "duration": 1.75,
+        "text": "hello there",
+    }
+    assert "speaker" not in jsr[1]
+    assert jsr2srt(jsr) == srt
+
+
+def test_vtt2jsr():
+    vtt = io.StringIO(
+        "WEBVTT\n\nNOTE comment\n\n"
+        "00:01.000 --> 00:02.500 align:start\n<v Bob>Hi\nthere</v>\n\n"
+        "cue-2\n00:00:03.000 --> 00:00:04.000\nno speaker\n"
+    )
+    jsr = list(iter_subtitles(vtt))
+
+    assert [replica.get("speaker") for replica in jsr] == [{"idx": "Bob"}, None]
+    assert jsr[0]["speech"]["text"] == "Hi there"
+    assert jsr[1]["speech"]["time_start"] == 3.0
+
+
+def test_srt_writer_errors(tmp_path):
+    with BackgroundWriter() as writer:
+        srt = jsr2srt(JSR, str(tmp_path / "subs.srt"), writer=writer)
+        writer.flush()
+        assert open(str(tmp_path / "subs.srt")).read() == srt
+
+        rttm2srt(RTTM, str(tmp_path / "not_exist" / "subs.srt"), writer=writer)
+        with pytest.raises(FileNotFoundError):
+            writer.flush()
+
+
+def test_subtitles_index(tmp_path):
+    jsr = [
+        {"speech": {"time_start": i, "time_end": i + 1.5, "text": f"cue {i}"}}
+        for i in range(100)
+    ]
+    jsr.append({"speech": {"time_start": 10.2, "time_end": 60, "text": "long"}})
+    path_vtt = str(tmp_path / "subs.vtt")
+    jsr2srt(jsr, path_vtt, fmt="vtt")
+
+    index = SubtitlesIndex(path_vtt)
+    assert len(index) == 101
+    assert [r["speech"]["text"] for r in index.cues_at(50.3)] == [
+        "long",
+        "cue 49",
+        "cue 50",
+    ]
+    assert index.cues_at(200) == []
+
+    index.save(str(tmp_path / "subs.idx"))
+    loaded = SubtitlesIndex.load(path_vtt, str(tmp_path / "subs.idx"))
+    assert loaded.cues_between(0, 0.5) == index.cues_between(0, 0.5)
+    assert loaded.cues_between(0, 0.5)[0]["speech"]["text"] == "cue 0"